@@ -1,40 +1,50 @@
 from flask import Flask
 from flask_sqlalchemy import SQLAlchemy
-from flask_migrate import Migrate
 from flask_cors import CORS
 from flask_jwt_extended import JWTManager
-from datetime import timedelta
-import os
-from dotenv import load_dotenv
+from sqlalchemy.orm import configure_mappers
+from config import Config  # also loads .env
 
-# Load environment variables
-load_dotenv()
+from app.utils.db_routing import RoutingSession
 
 # Initialize extensions
-db = SQLAlchemy()
-migrate = Migrate()
+db = SQLAlchemy(session_options={'class_': RoutingSession})
 jwt = JWTManager()
 
-def create_app():
+def create_app(config_class=Config):
     app = Flask(__name__)
     
     # Configure the Flask application
-    app.config['SQLALCHEMY_DATABASE_URI'] = os.getenv('DATABASE_URL', 'sqlite:///app.db')
-    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
-    app.config['JWT_SECRET_KEY'] = os.getenv('JWT_SECRET_KEY', 'your-secret-key')
-    app.config['JWT_ACCESS_TOKEN_EXPIRES'] = timedelta(hours=1)
+    app.config.from_object(config_class)
+    from app.utils.json_provider import make_json_provider
+    app.json = make_json_provider(app)
+    from app.utils.db_pool import build_engine_options
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = build_engine_options(app.config)
+    app.config['SQLALCHEMY_BINDS'] = {
+        f'replica_{index}': {'url': url, **build_engine_options(app.config, url, f'db_pool.replica_{index}')}
+        for index, url in enumerate(app.config['DATABASE_REPLICA_URLS'])
+    }
     
     # Initialize extensions with app
     db.init_app(app)
-    migrate.init_app(app, db)
+    from app.utils.migrations import init_migrations
+    init_migrations(app, db)
     jwt.init_app(app)
     
+    # Registered first so it also counts the conditional GET lookups
+    from app.utils.query_stats import init_query_stats
+    init_query_stats(app)
+    
+    # Before any hook that reads, so those reads can use a replica too
+    from app.utils.db_routing import init_db_routing
+    init_db_routing(app, db)
+    
     # Configure CORS
     CORS(app, resources={
         r"/api/*": {
-            "origins": ["http://localhost:3000", "https://localhost:3000", "https://student-management-nine-beige.vercel.app"],
-            "methods": ["GET", "POST", "PUT", "DELETE", "OPTIONS"],
-            "allow_headers": ["Content-Type", "Authorization"]
+            "origins": app.config['CORS_ORIGINS'],
+            "methods": app.config['CORS_METHODS'],
+            "allow_headers": app.config['CORS_HEADERS']
         }
     })
     
@@ -47,6 +57,8 @@ def create_app():
     from app.routes.major_routes import major_bp
     from app.routes.staff_routes import staff_bp
     from app.routes.privacy_setting_routes import privacy_bp
+    from app.routes.metrics_routes import metrics_bp
+    from app.routes.stats_routes import stats_bp
     
     app.register_blueprint(auth_bp)
     app.register_blueprint(students_bp)
@@ -56,5 +68,19 @@ def create_app():
     app.register_blueprint(major_bp)
     app.register_blueprint(staff_bp)
     app.register_blueprint(privacy_bp)
+    app.register_blueprint(metrics_bp)
+    app.register_blueprint(stats_bp)
+    
+    # Every model is imported by now; configure the mappers here rather
+    # than inside the first request (before the fork when preloaded)
+    configure_mappers()
+    
+    # ETags for the views marked with @depends_on, which answer If-None-Match
+    from app.utils.conditional import init_conditional_get
+    init_conditional_get(app)
+    
+    # Compress JSON, NDJSON and CSV bodies for clients that accept it
+    from app.utils.compression import init_compression
+    init_compression(app)
     
     return app 
\ No newline at end of file
@@ -19,4 +19,13 @@ class Course(db.Model):
             'description': self.description,
             'department': self.department.to_dict() if self.department else None,
             'created_at': self.created_at.isoformat() if self.created_at else None
-        } 
\ No newline at end of file
+        } 
+
+    def to_flat_dict(self):
+        return {
+            'id': self.id,
+            'name': self.name,
+            'description': self.description,
+            'department_id': self.department_id,
+            'created_at': self.created_at.isoformat() if self.created_at else None
+        }
\ No newline at end of file
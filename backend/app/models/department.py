@@ -17,4 +17,12 @@ class Department(db.Model):
             'name': self.name,
             'campus': self.campus.to_dict() if self.campus else None,
             'created_at': self.created_at.isoformat() if self.created_at else None
-        } 
\ No newline at end of file
+        } 
+
+    def to_flat_dict(self):
+        return {
+            'id': self.id,
+            'name': self.name,
+            'campus_id': self.campus_id,
+            'created_at': self.created_at.isoformat() if self.created_at else None
+        }
\ No newline at end of file
@@ -1,20 +1,65 @@
 from app import db
 from datetime import datetime
 
-class PrivacySetting(db.Model):
-    __tablename__ = 'privacy_settings'
+# Field -> bit registry for PrivacyProfile.private_mask: a field's bit is its
+# position in this tuple. Append new fields only; never reorder or remove.
+PRIVACY_FIELDS = (
+    "name", "registered_number", "year_of_admission", "mobile", "personal_email",
+    "emergency_contact", "present_address", "permanent_address", "photo_url"
+)
+PRIVACY_BITS = {field: 1 << bit for bit, field in enumerate(PRIVACY_FIELDS)}
 
-    id = db.Column(db.Integer, primary_key=True)
-    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
-    field_name = db.Column(db.String(50), nullable=False)
-    is_private = db.Column(db.Boolean, default=False)
-    created_at = db.Column(db.DateTime(timezone=True), default=datetime.utcnow)
+def privacy_bit(field_name):
+    if field_name not in PRIVACY_BITS:
+        raise ValueError(f'Unknown privacy field: {field_name}')
+    return PRIVACY_BITS[field_name]
+
+def private_fields(mask):
+    return [field for field in PRIVACY_FIELDS if mask & PRIVACY_BITS[field]]
+
+class PrivacyProfile(db.Model):
+    """All of a user's privacy settings as one bitmask; a set bit marks the
+    field private. Users without a row have every field public."""
+    __tablename__ = 'privacy_profiles'
+
+    user_id = db.Column(db.String(36), db.ForeignKey('users.id'), primary_key=True)
+    private_mask = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime(timezone=True), default=datetime.utcnow)
+
+    def is_private(self, field_name):
+        return bool((self.private_mask or 0) & privacy_bit(field_name))
+
+    def set_private(self, field_name, is_private):
+        bit = privacy_bit(field_name)
+        mask = self.private_mask or 0
+        self.private_mask = mask | bit if is_private else mask & ~bit
+        self.updated_at = datetime.utcnow()
 
     def to_dict(self):
         return {
-            'id': self.id,
             'user_id': self.user_id,
-            'field_name': self.field_name,
-            'is_private': self.is_private,
-            'created_at': self.created_at.isoformat() if self.created_at else None
-        } 
\ No newline at end of file
+            'private_fields': private_fields(self.private_mask or 0),
+            'updated_at': self.updated_at.isoformat() if self.updated_at else None
+        }
+
+    @staticmethod
+    def setting_id(user_id, field_name):
+        return f'{user_id}:{field_name}'
+
+    @staticmethod
+    def parse_setting_id(setting_id):
+        user_id, _, field_name = str(setting_id).rpartition(':')
+        if not user_id or field_name not in PRIVACY_BITS:
+            raise ValueError('Privacy setting not found')
+        return user_id, field_name
+
+    @staticmethod
+    def setting_dict(user_id, field_name, mask, updated_at=None):
+        """One field in the row-per-field shape the API has always returned."""
+        return {
+            'id': PrivacyProfile.setting_id(user_id, field_name),
+            'user_id': user_id,
+            'field_name': field_name,
+            'is_private': bool(mask & PRIVACY_BITS[field_name]),
+            'created_at': updated_at.isoformat() if updated_at else None
+        }
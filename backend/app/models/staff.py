@@ -1,9 +1,25 @@
 from app import db
+from app.utils.serialization import serialize_fields
 from datetime import datetime
 import uuid
 
 class Staff(db.Model):
     __tablename__ = 'staff'
+    __table_args__ = (
+        db.Index('idx_staff_user_id', 'user_id'),
+        db.Index('idx_staff_department_id', 'department_id'),
+        db.Index('idx_staff_campus_id', 'campus_id'),
+    )
+
+    # Keys of to_dict(); relations are serialized as nested objects
+    FIELDS = (
+        'id', 'user_id', 'full_name', 'department', 'campus', 'designation',
+        'mobile', 'email', 'created_at'
+    )
+    RELATIONS = ('department', 'campus')
+    # Relationship paths to_dict() walks; see eager_load_options
+    EAGER_LOAD = ('department.campus', 'campus')
+
     id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     user_id = db.Column(db.String(36), db.ForeignKey('users.id'), nullable=False)
     full_name = db.Column(db.String(100), nullable=False)
@@ -17,7 +33,9 @@ class Staff(db.Model):
     department = db.relationship('Department', backref='staff_members')
     campus = db.relationship('Campus', backref='staff_members')
 
-    def to_dict(self):
+    def to_dict(self, fields=None):
+        if fields is not None:
+            return serialize_fields(self, fields, self.RELATIONS)
         return {
             'id': self.id,
             'user_id': self.user_id,
@@ -0,0 +1,12 @@
+from app import db
+
+class StatCount(db.Model):
+    """One row per (dimension, group) of the dashboard statistics, e.g.
+    ('students.campus', <campus id>). Kept current by StatsService while
+    STATS_SUMMARY_TABLES is on."""
+    __tablename__ = 'stat_counts'
+
+    dimension = db.Column(db.String(64), primary_key=True)
+    # '' stands for NULL (e.g. students without a major)
+    group_key = db.Column(db.String(64), primary_key=True)
+    total = db.Column(db.Integer, nullable=False, default=0)
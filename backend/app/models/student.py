@@ -1,9 +1,42 @@
 from app import db
+from app.utils.serialization import serialize_fields
 from datetime import datetime
 import uuid
 
 class Student(db.Model):
     __tablename__ = 'students'
+    __table_args__ = (
+        # Backs the (name, id) keyset used to paginate the directory
+        db.Index('idx_students_name_id', 'name', 'id'),
+        # Directory filters, each followed by the keyset order so a filtered
+        # page is read in order instead of sorted
+        db.Index('idx_students_campus_name_id', 'campus_id', 'name', 'id'),
+        db.Index('idx_students_department_name_id', 'department_id', 'name', 'id'),
+        db.Index('idx_students_course_name_id', 'course_id', 'name', 'id'),
+        db.Index('idx_students_major_name_id', 'major_id', 'name', 'id'),
+        # Search only lists current students; the predicate must match the
+        # one search_students renders (a literal false, not a parameter)
+        db.Index('idx_students_current_name_id', 'name', 'id',
+                 postgresql_where=db.text('is_alumnus = false'),
+                 sqlite_where=db.text('is_alumnus = 0')),
+        db.Index('idx_students_user_id', 'user_id'),
+    )
+    
+    # Keys of to_dict(); relations are serialized as nested objects
+    FIELDS = (
+        'id', 'user_id', 'name', 'registered_number', 'year_of_admission',
+        'campus', 'course', 'major', 'department', 'mobile', 'personal_email',
+        'emergency_contact', 'present_address', 'permanent_address', 'photo_url',
+        'is_alumnus', 'created_at'
+    )
+    RELATIONS = ('campus', 'course', 'major', 'department')
+    # Keys of to_flat_dict()
+    FLAT_FIELDS = (
+        'id', 'user_id', 'name', 'registered_number', 'year_of_admission',
+        'campus_id', 'course_id', 'major_id', 'department_id', 'mobile', 'personal_email',
+        'emergency_contact', 'present_address', 'permanent_address', 'photo_url',
+        'is_alumnus', 'created_at'
+    )
     
     id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     user_id = db.Column(db.String(36), db.ForeignKey('users.id'), nullable=False)
@@ -29,17 +62,55 @@ class Student(db.Model):
     major = db.relationship('Major', backref='students')
     department = db.relationship('Department', backref='students')
     
-    def to_dict(self):
+    def to_dict(self, fields=None, references=None):
+        # `references` (a ReferenceSnapshot) resolves related objects from
+        # memory instead of through the relationships
+        if fields is not None:
+            return serialize_fields(self, fields, self.RELATIONS, references)
+        if references is not None:
+            campus = references.related('campus', self.campus_id)
+            course = references.related('course', self.course_id)
+            major = references.related('major', self.major_id)
+            department = references.related('department', self.department_id)
+        else:
+            campus = self.campus.to_dict() if self.campus else None
+            course = self.course.to_dict() if self.course else None
+            major = self.major.to_dict() if self.major else None
+            department = self.department.to_dict() if self.department else None
+        return {
+            'id': self.id,
+            'user_id': self.user_id,
+            'name': self.name,
+            'registered_number': self.registered_number,
+            'year_of_admission': self.year_of_admission,
+            'campus': campus,
+            'course': course,
+            'major': major,
+            'department': department,
+            'mobile': self.mobile,
+            'personal_email': self.personal_email,
+            'emergency_contact': self.emergency_contact,
+            'present_address': self.present_address,
+            'permanent_address': self.permanent_address,
+            'photo_url': self.photo_url,
+            'is_alumnus': self.is_alumnus,
+            'created_at': self.created_at.isoformat() if self.created_at else None
+        } 
+    
+    def to_flat_dict(self, fields=None):
+        # Same as to_dict() but references are foreign key ids only
+        if fields is not None:
+            return serialize_fields(self, fields)
         return {
             'id': self.id,
             'user_id': self.user_id,
             'name': self.name,
             'registered_number': self.registered_number,
             'year_of_admission': self.year_of_admission,
-            'campus': self.campus.to_dict() if self.campus else None,
-            'course': self.course.to_dict() if self.course else None,
-            'major': self.major.to_dict() if self.major else None,
-            'department': self.department.to_dict() if self.department else None,
+            'campus_id': self.campus_id,
+            'course_id': self.course_id,
+            'major_id': self.major_id,
+            'department_id': self.department_id,
             'mobile': self.mobile,
             'personal_email': self.personal_email,
             'emergency_contact': self.emergency_contact,
@@ -48,4 +119,4 @@ class Student(db.Model):
             'photo_url': self.photo_url,
             'is_alumnus': self.is_alumnus,
             'created_at': self.created_at.isoformat() if self.created_at else None
-        } 
\ No newline at end of file
+        }
\ No newline at end of file
@@ -1,10 +1,18 @@
 from app import db
 from datetime import datetime
 import uuid
-import bcrypt
+from app.utils.passwords import hash_password, verify_password, needs_rehash
+
+def normalize_email(email):
+    """Emails are matched case-insensitively, as stored in
+    idx_users_email_lower."""
+    return email.strip().lower()
 
 class User(db.Model):
     __tablename__ = 'users'
+    __table_args__ = (
+        db.Index('idx_users_email_lower', db.text('lower(email)')),
+    )
     
     id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     email = db.Column(db.String(120), unique=True, nullable=False)
@@ -16,12 +24,23 @@ class User(db.Model):
     student = db.relationship('Student', backref='user', uselist=False)
     staff = db.relationship('Staff', backref='user', uselist=False)
     
+    @staticmethod
+    def by_email(email):
+        """Query for the user with `email` in any case. An exact match wins
+        over accounts that differ only in case, which may predate this."""
+        return User.query.filter(db.func.lower(User.email) == normalize_email(email)).order_by(
+            User.email != email
+        )
+    
     def set_password(self, password):
-        salt = bcrypt.gensalt()
-        self.password = bcrypt.hashpw(password.encode('utf-8'), salt).decode('utf-8')
+        self.password = hash_password(password)
     
     def check_password(self, password):
-        return bcrypt.checkpw(password.encode('utf-8'), self.password.encode('utf-8'))
+        return verify_password(password, self.password)
+    
+    def password_needs_rehash(self):
+        # True when the hash was made with a different BCRYPT_ROUNDS
+        return needs_rehash(self.password)
     
     def to_dict(self):
         data = {
@@ -38,6 +57,9 @@ class User(db.Model):
 
 class UserRole(db.Model):
     __tablename__ = 'user_roles'
+    __table_args__ = (
+        db.Index('idx_user_roles_user_id', 'user_id'),
+    )
     
     id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     user_id = db.Column(db.String(36), db.ForeignKey('users.id'), nullable=False)
@@ -50,4 +72,19 @@ class UserRole(db.Model):
             'user_id': self.user_id,
             'role': self.role,
             'created_at': self.created_at.isoformat() if self.created_at else None
-        } 
\ No newline at end of file
+        } 
+
+class TokenVersion(db.Model):
+    __tablename__ = 'token_versions'
+    
+    # Bumped to revoke every token issued to the user before the bump
+    user_id = db.Column(db.String(36), db.ForeignKey('users.id'), primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    def to_dict(self):
+        return {
+            'user_id': self.user_id,
+            'version': self.version,
+            'updated_at': self.updated_at.isoformat() if self.updated_at else None
+        }
\ No newline at end of file
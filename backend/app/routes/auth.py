@@ -1,6 +1,6 @@
 from flask import Blueprint, request, jsonify
 from app.services.auth_service import AuthService
-from app.utils.decorators import handle_exceptions
+from app.utils.decorators import handle_exceptions, admin_required
 
 auth_bp = Blueprint('auth', __name__)
 
@@ -8,7 +8,7 @@ auth_bp = Blueprint('auth', __name__)
 @handle_exceptions
 def login():
     data = request.get_json()
-    result = AuthService.login(data)
+    result = AuthService.login(data, client_ip=request.remote_addr)
     return jsonify(result)
 
 @auth_bp.route('/api/auth/register', methods=['POST'])
@@ -16,4 +16,11 @@ def login():
 def register():
     data = request.get_json()
     result = AuthService.register(data)
-    return jsonify(result) 
\ No newline at end of file
+    return jsonify(result)
+
+@auth_bp.route('/api/auth/users/<user_id>/revoke-tokens', methods=['POST'])
+@handle_exceptions
+@admin_required
+def revoke_tokens(user_id):
+    result = AuthService.revoke_tokens(user_id)
+    return jsonify(result)
@@ -1,17 +1,23 @@
 from flask import Blueprint, request, jsonify
 from app.services.campus_service import CampusService
 from app.utils.decorators import handle_exceptions, admin_required, require_auth
+from app.utils.conditional import depends_on
+from app.utils.query_stats import query_budget
 
 campus_bp = Blueprint('campus', __name__)
 
 @campus_bp.route('/api/campuses', methods=['GET'])
+@query_budget(8)
 @handle_exceptions
+@depends_on('campuses')
 def get_campuses():
     campuses = CampusService.get_campuses()
     return jsonify({'data': campuses})
 
 @campus_bp.route('/api/campuses/<campus_id>', methods=['GET'])
+@query_budget(8)
 @handle_exceptions
+@depends_on('campuses')
 def get_campus(campus_id):
     campus = CampusService.get_campus(campus_id)
     return jsonify({'data': campus})
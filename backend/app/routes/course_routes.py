@@ -1,17 +1,23 @@
 from flask import Blueprint, request, jsonify
 from app.services.course_service import CourseService
 from app.utils.decorators import handle_exceptions, admin_required, require_auth
+from app.utils.conditional import depends_on
+from app.utils.query_stats import query_budget
 
 course_bp = Blueprint('course', __name__)
 
 @course_bp.route('/api/courses', methods=['GET'])
+@query_budget(8)
 @handle_exceptions
+@depends_on('courses', 'departments', 'campuses')
 def get_courses():
     courses = CourseService.get_courses()
     return jsonify({'data': courses})
 
 @course_bp.route('/api/courses/<course_id>', methods=['GET'])
+@query_budget(8)
 @handle_exceptions
+@depends_on('courses', 'departments', 'campuses')
 def get_course(course_id):
     course = CourseService.get_course(course_id)
     return jsonify({'data': course})
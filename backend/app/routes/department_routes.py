@@ -1,18 +1,24 @@
 from flask import Blueprint, request, jsonify
 from app.services.department_service import DepartmentService
 from app.utils.decorators import handle_exceptions, admin_required, require_auth
+from app.utils.conditional import depends_on
+from app.utils.query_stats import query_budget
 
 department_bp = Blueprint('department', __name__)
 
 @department_bp.route('/api/departments', methods=['GET'])
+@query_budget(8)
 @handle_exceptions
+@depends_on('departments', 'campuses')
 def get_departments():
     campus_id = request.args.get('campus_id')
     departments = DepartmentService.get_departments(campus_id)
     return jsonify({'data': departments})
 
 @department_bp.route('/api/departments/<department_id>', methods=['GET'])
+@query_budget(8)
 @handle_exceptions
+@depends_on('departments', 'campuses')
 def get_department(department_id):
     department = DepartmentService.get_department(department_id)
     return jsonify({'data': department})
@@ -1,17 +1,23 @@
 from flask import Blueprint, request, jsonify
 from app.services.major_service import MajorService
 from app.utils.decorators import handle_exceptions, admin_required, require_auth
+from app.utils.conditional import depends_on
+from app.utils.query_stats import query_budget
 
 major_bp = Blueprint('major', __name__)
 
 @major_bp.route('/api/majors', methods=['GET'])
+@query_budget(8)
 @handle_exceptions
+@depends_on('majors')
 def get_majors():
     majors = MajorService.get_majors()
     return jsonify({'data': majors})
 
 @major_bp.route('/api/majors/<major_id>', methods=['GET'])
+@query_budget(8)
 @handle_exceptions
+@depends_on('majors')
 def get_major(major_id):
     major = MajorService.get_major(major_id)
     return jsonify({'data': major})
@@ -0,0 +1,13 @@
+from flask import Blueprint, jsonify
+from app.utils.decorators import handle_exceptions, admin_required, require_auth
+from app.utils.metrics import metrics
+
+metrics_bp = Blueprint('metrics', __name__)
+
+@metrics_bp.route('/api/metrics', methods=['GET'])
+@handle_exceptions
+@require_auth
+@admin_required
+def get_metrics():
+    # Counters are per worker process
+    return jsonify({'data': metrics.snapshot()})
@@ -1,15 +1,17 @@
 from flask import Blueprint, request, jsonify
 from app.services.privacy_setting_service import PrivacySettingService
 from app.utils.decorators import handle_exceptions, login_required
+from app.utils.conditional import depends_on
+from app.utils.query_stats import query_budget
 from flask_jwt_extended import get_jwt_identity
-from app.models.privacy_setting import PrivacySetting
-from app import db
+from app.models.privacy_setting import PrivacyProfile
 
 privacy_bp = Blueprint('privacy', __name__)
 
 @privacy_bp.route('/api/privacy-settings', methods=['GET'])
 @handle_exceptions
 @login_required
+@depends_on('privacy_profiles')
 def get_privacy_settings():
     user_id = request.user.id
     settings = PrivacySettingService.get_privacy_settings(user_id)
@@ -18,6 +20,7 @@ def get_privacy_settings():
 @privacy_bp.route('/api/privacy-settings/<setting_id>', methods=['GET'])
 @handle_exceptions
 @login_required
+@depends_on('privacy_profiles')
 def get_privacy_setting(setting_id):
     setting = PrivacySettingService.get_privacy_setting(setting_id)
     return jsonify(setting)
@@ -56,7 +59,9 @@ def update_multiple_settings():
     return jsonify(result)
 
 @privacy_bp.route('/api/privacy-settings/student/<student_id>', methods=['GET', 'OPTIONS'])
+@query_budget(5)
 @handle_exceptions
+@depends_on('privacy_profiles', 'students')
 def get_privacy_settings_by_student(student_id):
     if request.method == 'OPTIONS':
         return '', 204
@@ -72,21 +77,18 @@ def update_privacy_setting_by_user_and_field():
     field_name = data.get('field_name')
     if user_id is None or field_name is None:
         return jsonify({'error': 'user_id and field_name are required'}), 400
-    setting = PrivacySetting.query.filter_by(user_id=user_id, field_name=field_name).first()
-    if not setting:
-        # Create the privacy setting if it doesn't exist
-        setting = PrivacySetting(user_id=user_id, field_name=field_name, is_private=data.get('is_private', False))
-        db.session.add(setting)
+    if 'is_private' in data:
+        setting = PrivacySettingService.set_field(user_id, field_name, data['is_private'])
     else:
-        if 'is_private' in data:
-            setting.is_private = data['is_private']
-    db.session.commit()
-    return jsonify(setting.to_dict())
+        setting = PrivacySettingService.get_privacy_setting(PrivacyProfile.setting_id(user_id, field_name))
+    return jsonify(setting)
 
 # New route to get privacy settings by user ID
 @privacy_bp.route('/api/privacy-settings/by-user/<user_id>', methods=['GET'])
+@query_budget(4)
 @handle_exceptions
 @login_required
+@depends_on('privacy_profiles')
 def get_privacy_settings_by_user(user_id):
     # Optional: Add a check here to ensure the logged-in user matches the requested user_id
     # from flask_jwt_extended import get_jwt_identity
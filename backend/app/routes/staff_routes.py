@@ -1,19 +1,26 @@
 from flask import Blueprint, request, jsonify
 from app.services.staff_service import StaffService
 from app.utils.decorators import handle_exceptions, admin_required
+from app.utils.conditional import depends_on
+from app.utils.query_stats import query_budget
 
 staff_bp = Blueprint('staff', __name__)
 
 @staff_bp.route('/api/staff', methods=['GET'])
+@query_budget(7)
 @handle_exceptions
+@depends_on('staff', 'departments', 'campuses')
 def get_staff_members():
     campus_id = request.args.get('campus_id')
     department_id = request.args.get('department_id')
-    staff_members = StaffService.get_staff_members(campus_id, department_id)
+    fields = request.args.get('fields')
+    staff_members = StaffService.get_staff_members(campus_id, department_id, fields)
     return jsonify({'data': staff_members})
 
 @staff_bp.route('/api/staff/<staff_id>', methods=['GET'])
+@query_budget(7)
 @handle_exceptions
+@depends_on('staff', 'departments', 'campuses')
 def get_staff_member(staff_id):
     staff = StaffService.get_staff_member(staff_id)
     return jsonify({'data': staff})
@@ -0,0 +1,32 @@
+import click
+from flask import Blueprint, jsonify
+from app.services.stats_service import StatsService
+from app.utils.decorators import handle_exceptions, admin_required, require_auth
+from app.utils.conditional import depends_on
+from app.utils.query_stats import query_budget
+
+stats_bp = Blueprint('stats', __name__)
+
+@stats_bp.route('/api/stats', methods=['GET'])
+@query_budget(15)
+@handle_exceptions
+@require_auth
+@admin_required
+@depends_on('students', 'staff', 'campuses', 'departments', 'courses', 'majors')
+def get_stats():
+    return jsonify({'data': StatsService.get_stats()})
+
+@stats_bp.route('/api/stats/<entity>/<group>', methods=['GET'])
+@query_budget(9)
+@handle_exceptions
+@require_auth
+@admin_required
+@depends_on('students', 'staff', 'campuses', 'departments', 'courses', 'majors')
+def get_stats_group(entity, group):
+    return jsonify({'data': StatsService.get_group(entity, group)})
+
+@stats_bp.cli.command('rebuild')
+def rebuild_stats():
+    """Recompute the stat_counts summary table."""
+    rows = StatsService.rebuild_summaries()
+    click.echo(f'Rebuilt {rows} stat_counts rows')
@@ -1,20 +1,41 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, Response, request, jsonify, stream_with_context
 from app.services.student_service import StudentService
-from app.utils.decorators import handle_exceptions, require_auth
+from app.services.student_import_service import StudentImportService
+from app.utils.decorators import handle_exceptions, require_auth, admin_required, get_current_viewer
+from app.utils.conditional import depends_on
+from app.utils.query_stats import query_budget
+from app.utils.db_routing import read_only
 
 students_bp = Blueprint('students', __name__)
 
 @students_bp.route('/api/students', methods=['GET'])
+@query_budget(10)
 @handle_exceptions
+@depends_on('students', 'privacy_profiles', 'campuses', 'departments', 'courses', 'majors')
 def get_students():
     filters = request.args.to_dict()
-    result = StudentService.get_students(filters)
-    return jsonify({'data': result})
+    result = StudentService.get_students(filters, get_current_viewer())
+    return jsonify(result)
+
+@students_bp.route('/api/students/export', methods=['GET'])
+@handle_exceptions
+@require_auth
+@admin_required
+def export_students():
+    filters = request.args.to_dict()
+    fmt = filters.pop('format', 'csv')
+    chunks = StudentService.export_students(filters, fmt)
+    mimetype = 'application/x-ndjson' if fmt == 'ndjson' else 'text/csv'
+    response = Response(stream_with_context(chunks), mimetype=mimetype)
+    response.headers['Content-Disposition'] = f'attachment; filename=students.{fmt}'
+    return response
 
 @students_bp.route('/api/students/<student_id>', methods=['GET'])
+@query_budget(5)
 @handle_exceptions
+@depends_on('students', 'privacy_profiles', 'campuses', 'departments', 'courses', 'majors')
 def get_student(student_id):
-    result = StudentService.get_student(student_id)
+    result = StudentService.get_student(student_id, get_current_viewer())
     return jsonify({'data': result})
 
 @students_bp.route('/api/students', methods=['POST'])
@@ -41,8 +62,25 @@ def delete_student(student_id):
     return jsonify(result)
 
 @students_bp.route('/api/students/search', methods=['POST'])
+@read_only
+@query_budget(10)
 @handle_exceptions
 def search_students():
     criteria = request.get_json() or {}
-    result = StudentService.search_students(criteria)
-    return jsonify({'data': result}) 
\ No newline at end of file
+    for option in ('shape', 'fields'):
+        if option in request.args:
+            criteria[option] = request.args[option]
+    result = StudentService.search_students(criteria, get_current_viewer())
+    return jsonify(result) 
+
+@students_bp.route('/api/students/import', methods=['POST'])
+@handle_exceptions
+@require_auth
+@admin_required
+def import_students():
+    # The body is streamed; never touch request.data/get_json() here
+    fmt = request.args.get('format')
+    if not fmt:
+        fmt = 'ndjson' if request.mimetype in ('application/x-ndjson', 'application/ndjson') else 'csv'
+    result = StudentImportService.import_students(request.stream, fmt)
+    return jsonify(result)
\ No newline at end of file
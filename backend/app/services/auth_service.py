@@ -1,28 +1,72 @@
-from app.models.user import User, UserRole
+from flask import current_app
+from app.models.user import User, UserRole, normalize_email
 from app.models.student import Student
 from app import db
-from flask_jwt_extended import create_access_token
+from app.services.token_service import TokenService
+from app.utils.db_routing import note_writer
+from app.utils.errors import TooManyRequests
+from app.utils.metrics import metrics
+from app.utils.rate_limit import get_backend, limit
+
+LOGIN_LIMIT_MESSAGE = 'Too many login attempts, please retry later'
+
+def _unknown_email_key(email):
+    return f'login:unknown:{normalize_email(email)}'
 
 class AuthService:
     @staticmethod
-    def login(data):
+    def login(data, client_ip=None):
         email = data.get('email')
         password = data.get('password')
         
         if not email or not password:
             raise ValueError('Email and password are required')
+        if not isinstance(email, str) or not isinstance(password, str):
+            raise ValueError('Email and password must be strings')
+        
+        # Throttle per client and per account before any database or bcrypt work
+        config = current_app.config
+        if client_ip:
+            limit('login_ip', client_ip, config['LOGIN_RATE_LIMIT_IP'], LOGIN_LIMIT_MESSAGE)
+        limit('login_email', normalize_email(email), config['LOGIN_RATE_LIMIT_EMAIL'], LOGIN_LIMIT_MESSAGE)
         
-        user = User.query.filter_by(email=email).first()
-        if not user or not user.check_password(password):
+        # Emails recently found not to exist are rejected without a query.
+        # Only with a shared backend: registering clears the entry there,
+        # but could not clear it in another worker's memory
+        backend = get_backend()
+        use_cache = backend.shared and config['LOGIN_UNKNOWN_EMAIL_CACHE_SECONDS'] > 0
+        if use_cache and backend.get(_unknown_email_key(email)) is not None:
+            metrics.inc('login.unknown_email_cache.hits')
+            raise ValueError('Invalid email or password')
+        
+        # Case-insensitive, like the two keys above
+        user = User.by_email(email).first()
+        if not user:
+            if use_cache:
+                ttl = config['LOGIN_UNKNOWN_EMAIL_CACHE_SECONDS']
+                backend.set(_unknown_email_key(email), '1', ttl)
+                metrics.inc('login.unknown_email_cache.stores')
+            raise ValueError('Invalid email or password')
+        if not user.check_password(password):
             raise ValueError('Invalid email or password')
         
+        # Upgrade hashes made with an old cost factor while we have the
+        # plaintext; if the hash pool is busy, try again on the next login
+        if user.password_needs_rehash():
+            try:
+                user.set_password(password)
+                db.session.commit()
+                metrics.inc('password_hash.rehashed')
+            except TooManyRequests:
+                pass
+        
         # Get user role
         user_role = UserRole.query.filter_by(user_id=user.id).first()
         if not user_role:
             raise ValueError('User role not found')
         
         # Create access token
-        access_token = create_access_token(identity=user.id)
+        access_token = TokenService.create_token(user.id, user_role.role)
         
         return {
             'data': {
@@ -32,6 +76,23 @@ class AuthService:
             }
         }
     
+    @staticmethod
+    def forget_unknown_emails(emails):
+        """Drop cached "no such user" results; call after committing users
+        with these emails."""
+        keys = [_unknown_email_key(email) for email in emails if email]
+        if keys:
+            get_backend().delete(*keys)
+    
+    @staticmethod
+    def revoke_tokens(user_id):
+        """Sign `user_id` out everywhere: every token issued so far stops
+        working, the next login gets a fresh one."""
+        User.query.get_or_404(user_id)
+        TokenService.revoke_user_tokens(user_id)
+        db.session.commit()
+        return {'message': 'Tokens revoked'}
+    
     @staticmethod
     def register(data):
         email = data.get('email')
@@ -41,7 +102,7 @@ class AuthService:
         if not email or not password:
             raise ValueError('Email and password are required')
         
-        if User.query.filter_by(email=email).first():
+        if User.by_email(email).first():
             raise ValueError('Email already registered')
         
         # Create user
@@ -74,9 +135,11 @@ class AuthService:
             db.session.add(student)
         
         db.session.commit()
+        AuthService.forget_unknown_emails([email])
+        note_writer(user.id)
         
         # Create access token
-        access_token = create_access_token(identity=user.id)
+        access_token = TokenService.create_token(user.id, role)
         
         return {
             'data': {
@@ -1,22 +1,22 @@
 from app.models.campus import Campus
 from app import db
+from app.services.reference_cache import ReferenceCache
 
 class CampusService:
     @staticmethod
     def get_campuses():
-        campuses = Campus.query.all()
-        return [campus.to_dict() for campus in campuses]
+        return ReferenceCache.get_all('campuses')
     
     @staticmethod
     def get_campus(campus_id):
-        campus = Campus.query.get_or_404(campus_id)
-        return campus.to_dict()
+        return ReferenceCache.get_or_404('campuses', campus_id)
     
     @staticmethod
     def create_campus(data):
         campus = Campus(**data)
         db.session.add(campus)
         db.session.commit()
+        ReferenceCache.invalidate()
         return campus.to_dict()
     
     @staticmethod
@@ -28,6 +28,7 @@ class CampusService:
                 setattr(campus, key, value)
         
         db.session.commit()
+        ReferenceCache.invalidate()
         return campus.to_dict()
     
     @staticmethod
@@ -35,4 +36,5 @@ class CampusService:
         campus = Campus.query.get_or_404(campus_id)
         db.session.delete(campus)
         db.session.commit()
+        ReferenceCache.invalidate()
         return {'message': 'Campus deleted successfully'} 
\ No newline at end of file
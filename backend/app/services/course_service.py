@@ -1,22 +1,22 @@
 from app.models.course import Course
 from app import db
+from app.services.reference_cache import ReferenceCache
 
 class CourseService:
     @staticmethod
     def get_courses():
-        courses = Course.query.all()
-        return [course.to_dict() for course in courses]
+        return ReferenceCache.get_all('courses')
     
     @staticmethod
     def get_course(course_id):
-        course = Course.query.get_or_404(course_id)
-        return course.to_dict()
+        return ReferenceCache.get_or_404('courses', course_id)
     
     @staticmethod
     def create_course(data):
         course = Course(**data)
         db.session.add(course)
         db.session.commit()
+        ReferenceCache.invalidate()
         return course.to_dict()
     
     @staticmethod
@@ -28,6 +28,7 @@ class CourseService:
                 setattr(course, key, value)
         
         db.session.commit()
+        ReferenceCache.invalidate()
         return course.to_dict()
     
     @staticmethod
@@ -35,4 +36,5 @@ class CourseService:
         course = Course.query.get_or_404(course_id)
         db.session.delete(course)
         db.session.commit()
+        ReferenceCache.invalidate()
         return {'message': 'Course deleted successfully'} 
\ No newline at end of file
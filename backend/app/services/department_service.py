@@ -1,25 +1,29 @@
 from app.models.department import Department
 from app import db
+from app.services.reference_cache import ReferenceCache
 
 class DepartmentService:
     @staticmethod
     def get_departments(campus_id=None):
-        query = Department.query
-        if campus_id:
-            query = query.filter_by(campus_id=campus_id)
-        departments = query.all()
-        return [dept.to_dict() for dept in departments]
+        if not campus_id:
+            return ReferenceCache.get_all('departments')
+        snapshot = ReferenceCache.snapshot()
+        return [
+            snapshot.nested['departments'][dept_id]
+            for dept_id, dept in snapshot.flat['departments'].items()
+            if dept['campus_id'] == campus_id
+        ]
     
     @staticmethod
     def get_department(department_id):
-        department = Department.query.get_or_404(department_id)
-        return department.to_dict()
+        return ReferenceCache.get_or_404('departments', department_id)
     
     @staticmethod
     def create_department(data):
         department = Department(**data)
         db.session.add(department)
         db.session.commit()
+        ReferenceCache.invalidate()
         return department.to_dict()
     
     @staticmethod
@@ -31,6 +35,7 @@ class DepartmentService:
                 setattr(department, key, value)
         
         db.session.commit()
+        ReferenceCache.invalidate()
         return department.to_dict()
     
     @staticmethod
@@ -38,4 +43,5 @@ class DepartmentService:
         department = Department.query.get_or_404(department_id)
         db.session.delete(department)
         db.session.commit()
+        ReferenceCache.invalidate()
         return {'message': 'Department deleted successfully'} 
\ No newline at end of file
@@ -1,22 +1,22 @@
 from app.models.major import Major
 from app import db
+from app.services.reference_cache import ReferenceCache
 
 class MajorService:
     @staticmethod
     def get_majors():
-        majors = Major.query.all()
-        return [major.to_dict() for major in majors]
+        return ReferenceCache.get_all('majors')
     
     @staticmethod
     def get_major(major_id):
-        major = Major.query.get_or_404(major_id)
-        return major.to_dict()
+        return ReferenceCache.get_or_404('majors', major_id)
     
     @staticmethod
     def create_major(data):
         major = Major(**data)
         db.session.add(major)
         db.session.commit()
+        ReferenceCache.invalidate()
         return major.to_dict()
     
     @staticmethod
@@ -28,6 +28,7 @@ class MajorService:
                 setattr(major, key, value)
         
         db.session.commit()
+        ReferenceCache.invalidate()
         return major.to_dict()
     
     @staticmethod
@@ -35,4 +36,5 @@ class MajorService:
         major = Major.query.get_or_404(major_id)
         db.session.delete(major)
         db.session.commit()
+        ReferenceCache.invalidate()
         return {'message': 'Major deleted successfully'} 
\ No newline at end of file
@@ -1,80 +1,145 @@
-from app import db
-from app.models.privacy_setting import PrivacySetting
 from datetime import datetime
-from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy import exists, inspect, or_
+from app import db
+from app.models.privacy_setting import PrivacyProfile, PRIVACY_FIELDS, privacy_bit, private_fields
 from app.models.student import Student
+from app.utils.upsert import UPSERT_DIALECTS
+from app.utils.versioning import bump_version
+
+# Bounded IN lists keep large pages under driver bind-parameter limits
+PRIVATE_FIELDS_BATCH_SIZE = 500
 
 class PrivacySettingService:
+    """Privacy settings are stored as one PrivacyProfile bitmask per user but
+    exposed in the original row-per-field JSON shape; setting ids are
+    `<user_id>:<field_name>`."""
+    
+    @staticmethod
+    def get_private_fields(user_ids):
+        """Return {user_id: set of private field names} for `user_ids`,
+        with one query per PRIVATE_FIELDS_BATCH_SIZE users."""
+        user_ids = list(user_ids)
+        private = {}
+        for start in range(0, len(user_ids), PRIVATE_FIELDS_BATCH_SIZE):
+            batch = user_ids[start:start + PRIVATE_FIELDS_BATCH_SIZE]
+            rows = db.session.query(PrivacyProfile.user_id, PrivacyProfile.private_mask).filter(
+                PrivacyProfile.user_id.in_(batch),
+                PrivacyProfile.private_mask != 0
+            )
+            for user_id, mask in rows:
+                private[user_id] = set(private_fields(mask))
+        return private
+    
+    @staticmethod
+    def visible_filter(fields, viewer=None):
+        """SQL condition keeping the students whose `fields` are all visible
+        to `viewer`: none of them is private, or it is the viewer's own
+        record. None for admins, who see everything."""
+        if viewer and viewer.get('role') == 'admin':
+            return None
+        mask = 0
+        for field in fields:
+            mask |= privacy_bit(field)
+        hidden = exists().where(
+            PrivacyProfile.user_id == Student.user_id,
+            PrivacyProfile.private_mask.op('&')(mask) != 0
+        )
+        if viewer and viewer.get('user_id'):
+            return or_(~hidden, Student.user_id == viewer['user_id'])
+        return ~hidden
+    
+    @staticmethod
+    def _settings(user_id, profile):
+        mask = profile.private_mask if profile else 0
+        updated_at = profile.updated_at if profile else None
+        return [PrivacyProfile.setting_dict(user_id, field, mask, updated_at) for field in PRIVACY_FIELDS]
+    
+    @staticmethod
+    def _get_or_create_profile(user_id):
+        profile = db.session.get(PrivacyProfile, user_id)
+        if not profile:
+            profile = PrivacyProfile(user_id=user_id, private_mask=0)
+            db.session.add(profile)
+        return profile
+    
     @staticmethod
     def get_privacy_settings(user_id):
-        settings = PrivacySetting.query.filter_by(user_id=user_id).all()
-        return [setting.to_dict() for setting in settings]
+        profile = db.session.get(PrivacyProfile, user_id)
+        return PrivacySettingService._settings(user_id, profile)
     
     @staticmethod
     def get_privacy_setting(setting_id):
-        setting = PrivacySetting.query.get(setting_id)
-        if not setting:
-            raise ValueError('Privacy setting not found')
-        return setting.to_dict()
+        user_id, field_name = PrivacyProfile.parse_setting_id(setting_id)
+        profile = db.session.get(PrivacyProfile, user_id)
+        if not profile:
+            return PrivacyProfile.setting_dict(user_id, field_name, 0)
+        return PrivacyProfile.setting_dict(user_id, field_name, profile.private_mask, profile.updated_at)
     
     @staticmethod
     def create_privacy_setting(data):
-        stmt = insert(PrivacySetting).values(
-            user_id=data['user_id'],
-            field_name=data['field_name'],
-            is_private=data.get('is_private', False),
-            created_at=datetime.utcnow()
-        ).on_conflict_do_update(
-            index_elements=['user_id', 'field_name'],
-            set_={
-                'is_private': data.get('is_private', False),
-                'created_at': datetime.utcnow()
-            }
+        return PrivacySettingService.set_field(
+            data['user_id'], data['field_name'], data.get('is_private', False)
         )
-        db.session.execute(stmt)
+    
+    @staticmethod
+    def set_field(user_id, field_name, is_private):
+        privacy_bit(field_name)
+        profile = PrivacySettingService._get_or_create_profile(user_id)
+        profile.set_private(field_name, is_private)
         db.session.commit()
-        # Return the upserted/updated record
-        setting = PrivacySetting.query.filter_by(user_id=data['user_id'], field_name=data['field_name']).first()
-        return setting.to_dict() if setting else None
+        return PrivacyProfile.setting_dict(user_id, field_name, profile.private_mask, profile.updated_at)
     
     @staticmethod
     def update_privacy_setting(setting_id, data):
-        setting = PrivacySetting.query.get(setting_id)
-        if not setting:
-            raise ValueError('Privacy setting not found')
-        
-        if 'is_private' in data:
-            setting.is_private = data['is_private']
-        
-        db.session.commit()
-        return setting.to_dict()
+        user_id, field_name = PrivacyProfile.parse_setting_id(setting_id)
+        if 'is_private' not in data:
+            return PrivacySettingService.get_privacy_setting(setting_id)
+        return PrivacySettingService.set_field(user_id, field_name, data['is_private'])
     
     @staticmethod
     def delete_privacy_setting(setting_id):
-        setting = PrivacySetting.query.get(setting_id)
-        if not setting:
-            raise ValueError('Privacy setting not found')
-        
-        db.session.delete(setting)
-        db.session.commit()
+        # Deleting a setting restores the default, which is public
+        user_id, field_name = PrivacyProfile.parse_setting_id(setting_id)
+        profile = db.session.get(PrivacyProfile, user_id)
+        if profile:
+            profile.set_private(field_name, False)
+            db.session.commit()
         return {'message': 'Privacy setting deleted successfully'}
     
     @staticmethod
     def update_multiple_settings(user_id, settings_data):
+        # Fold the whole payload into two masks: the bits being written and
+        # which of those end up set
+        touched = set_bits = 0
         for setting_data in settings_data:
-            stmt = insert(PrivacySetting).values(
-                user_id=user_id,
-                field_name=setting_data['field_name'],
-                is_private=setting_data['is_private'],
-                created_at=datetime.utcnow()
-            ).on_conflict_do_update(
-                index_elements=['user_id', 'field_name'],
+            bit = privacy_bit(setting_data['field_name'])
+            touched |= bit
+            if setting_data['is_private']:
+                set_bits |= bit
+        
+        dialect = db.session.get_bind(mapper=inspect(PrivacyProfile)).dialect.name
+        if dialect in UPSERT_DIALECTS:
+            # One INSERT .. ON CONFLICT DO UPDATE, whatever the payload size
+            table = PrivacyProfile.__table__
+            now = datetime.utcnow()
+            stmt = UPSERT_DIALECTS[dialect](table).values(
+                user_id=user_id, private_mask=set_bits, updated_at=now
+            )
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[table.c.user_id],
                 set_={
-                    'is_private': setting_data['is_private'],
-                    'created_at': datetime.utcnow()
+                    # Clear the touched bits, then set the private ones
+                    'private_mask': (table.c.private_mask.op('|')(touched) - touched).op('|')(set_bits),
+                    'updated_at': now
                 }
             )
             db.session.execute(stmt)
+            # Core statements bypass the flush hook that bumps the version
+            bump_version(db.session, PrivacyProfile.__tablename__)
+        else:
+            profile = PrivacySettingService._get_or_create_profile(user_id)
+            profile.private_mask = ((profile.private_mask or 0) & ~touched) | set_bits
+            profile.updated_at = datetime.utcnow()
         
         db.session.commit()
         return {'message': 'Privacy settings updated successfully'}
@@ -84,5 +149,4 @@ class PrivacySettingService:
         student = Student.query.get(student_id)
         if not student:
             return []
-        settings = PrivacySetting.query.filter_by(user_id=student.user_id).all()
-        return [setting.to_dict() for setting in settings] 
\ No newline at end of file
+        return PrivacySettingService.get_privacy_settings(student.user_id)
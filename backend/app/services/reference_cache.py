@@ -0,0 +1,119 @@
+import threading
+from flask import g, has_request_context, abort
+from app import db
+from app.models.campus import Campus
+from app.models.course import Course
+from app.models.department import Department
+from app.models.major import Major
+from app.utils.versioning import track_tables, get_versions
+
+REFERENCE_TABLES = ('campuses', 'departments', 'courses', 'majors')
+track_tables(*REFERENCE_TABLES)
+
+# Relation name on Student/Staff -> snapshot attribute
+RELATION_TABLES = {
+    'campus': 'campuses',
+    'department': 'departments',
+    'course': 'courses',
+    'major': 'majors'
+}
+
+class ReferenceSnapshot:
+    """Campuses, departments, courses and majors serialized once, keyed by id."""
+
+    def __init__(self, versions):
+        self.versions = versions
+        # Loaded parents first so that department.campus and course.department
+        # resolve from the identity map instead of issuing one query per row
+        campuses = Campus.query.all()
+        departments = Department.query.all()
+        courses = Course.query.all()
+        majors = Major.query.all()
+
+        self.nested = {
+            'campuses': {campus.id: campus.to_dict() for campus in campuses},
+            'departments': {dept.id: dept.to_dict() for dept in departments},
+            'courses': {course.id: course.to_dict() for course in courses},
+            'majors': {major.id: major.to_dict() for major in majors}
+        }
+        self.flat = {
+            'campuses': self.nested['campuses'],
+            'departments': {dept.id: dept.to_flat_dict() for dept in departments},
+            'courses': {course.id: course.to_flat_dict() for course in courses},
+            'majors': self.nested['majors']
+        }
+
+    def ids_by_name(self, table_name):
+        """{lowercased name: [ids]}; names are not unique (e.g. a "Physics"
+        department on two campuses), so callers disambiguate."""
+        names = {}
+        for entity_id, entity in self.flat[table_name].items():
+            names.setdefault((entity['name'] or '').strip().lower(), []).append(entity_id)
+        return names
+
+    def related(self, relation, related_id):
+        """Nested dict for `relation` ('campus', 'course', ...) or None."""
+        if not related_id:
+            return None
+        return self.nested[RELATION_TABLES[relation]].get(related_id)
+
+    def included(self, campus_ids=(), department_ids=(), course_ids=(), major_ids=()):
+        """Flat lookup tables for the given ids, following course -> department
+        -> campus references so the client can resolve every id it receives."""
+        courses = {i: self.flat['courses'][i] for i in course_ids if i in self.flat['courses']}
+        department_ids = set(department_ids) | {c['department_id'] for c in courses.values() if c['department_id']}
+        departments = {i: self.flat['departments'][i] for i in department_ids if i in self.flat['departments']}
+        campus_ids = set(campus_ids) | {d['campus_id'] for d in departments.values() if d['campus_id']}
+        return {
+            'campuses': {i: self.flat['campuses'][i] for i in campus_ids if i in self.flat['campuses']},
+            'departments': departments,
+            'courses': courses,
+            'majors': {i: self.flat['majors'][i] for i in major_ids if i in self.flat['majors']}
+        }
+
+class ReferenceCache:
+    """Per-process cache of reference data.
+
+    Every write to one of REFERENCE_TABLES bumps its row in `table_versions`
+    in the same transaction. Readers compare those versions against the
+    snapshot at most once per request, so a write made by any worker is
+    picked up by every other worker on its next request.
+    """
+    _snapshots = {}
+    _lock = threading.Lock()
+
+    @staticmethod
+    def snapshot():
+        key = str(db.engine.url)
+        snapshot = ReferenceCache._snapshots.get(key)
+        if snapshot is not None and has_request_context() and g.get('_reference_cache_checked'):
+            return snapshot
+
+        versions = get_versions(REFERENCE_TABLES)
+        if snapshot is None or snapshot.versions != versions:
+            with ReferenceCache._lock:
+                snapshot = ReferenceCache._snapshots.get(key)
+                if snapshot is None or snapshot.versions != versions:
+                    snapshot = ReferenceSnapshot(versions)
+                    ReferenceCache._snapshots[key] = snapshot
+
+        if has_request_context():
+            g._reference_cache_checked = True
+        return snapshot
+
+    @staticmethod
+    def invalidate():
+        ReferenceCache._snapshots.pop(str(db.engine.url), None)
+        if has_request_context():
+            g.pop('_reference_cache_checked', None)
+
+    @staticmethod
+    def get_all(table_name):
+        return list(ReferenceCache.snapshot().nested[table_name].values())
+
+    @staticmethod
+    def get_or_404(table_name, entity_id):
+        entity = ReferenceCache.snapshot().nested[table_name].get(entity_id)
+        if entity is None:
+            abort(404)
+        return entity
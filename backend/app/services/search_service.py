@@ -0,0 +1,143 @@
+import re
+import time
+from sqlalchemy import DDL, Float, cast, column, event, func, inspect, literal_column, select, table
+from app import db
+from app.models.student import Student
+
+FTS_TABLE = 'students_fts'
+# Privacy fields a search term is matched against
+SEARCH_FIELDS = ('name', 'registered_number')
+
+# SQLite: a standalone FTS5 trigram table kept in sync with `students` by
+# triggers, so substring matches are index-served (needs SQLite 3.34+).
+# It is keyed by the student's UUID rather than the implicit rowid because
+# VACUUM is free to renumber rowids of tables without an INTEGER PRIMARY KEY.
+SQLITE_DDL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS students_fts USING fts5("
+    "student_id UNINDEXED, name, registered_number, tokenize = 'trigram')",
+    "CREATE TRIGGER IF NOT EXISTS students_fts_ai AFTER INSERT ON students BEGIN "
+    "INSERT INTO students_fts (student_id, name, registered_number) "
+    "VALUES (new.id, new.name, new.registered_number); END",
+    "CREATE TRIGGER IF NOT EXISTS students_fts_ad AFTER DELETE ON students BEGIN "
+    "DELETE FROM students_fts WHERE student_id = old.id; END",
+    "CREATE TRIGGER IF NOT EXISTS students_fts_au AFTER UPDATE OF id, name, registered_number ON students BEGIN "
+    "UPDATE students_fts SET student_id = new.id, name = new.name, registered_number = new.registered_number "
+    "WHERE student_id = old.id; END",
+]
+
+# PostgreSQL: a GIN index over the search document for ranked prefix matching,
+# plus trigram indexes so substring matches on names and registered numbers
+# (e.g. "CS042" inside "2021CS042") are index-served as well.
+POSTGRES_DDL = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE INDEX IF NOT EXISTS idx_students_search_document ON students USING gin "
+    "(to_tsvector('simple', coalesce(name, '') || ' ' || coalesce(registered_number, '')))",
+    "CREATE INDEX IF NOT EXISTS idx_students_name_trgm ON students USING gin (name gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS idx_students_registered_number_trgm ON students USING gin "
+    "(registered_number gin_trgm_ops)",
+]
+
+# Keep `db.create_all()` (init_db.py, recreate_db.py) in step with the migration
+for statement in SQLITE_DDL:
+    event.listen(Student.__table__, 'after_create', DDL(statement).execute_if(dialect='sqlite'))
+for statement in POSTGRES_DDL:
+    event.listen(Student.__table__, 'after_create', DDL(statement).execute_if(dialect='postgresql'))
+event.listen(
+    Student.__table__, 'before_drop',
+    DDL('DROP TABLE IF EXISTS students_fts').execute_if(dialect='sqlite')
+)
+
+# Engine URL -> (table exists, monotonic time of the check). A missing
+# table is looked for again after FTS_RECHECK_SECONDS, so running the
+# migration takes effect without a restart.
+_fts_available = {}
+FTS_RECHECK_SECONDS = 60
+
+def _tokenize(term):
+    return re.findall(r'\w+', term.lower())
+
+def _has_fts_table(engine):
+    key = str(engine.url)
+    now = time.monotonic()
+    available, checked_at = _fts_available.get(key, (False, None))
+    if not available and (checked_at is None or now - checked_at >= FTS_RECHECK_SECONDS):
+        available = inspect(engine).has_table(FTS_TABLE)
+        _fts_available[key] = (available, now)
+    return available
+
+def _search_document():
+    # Rendered to match idx_students_search_document exactly so the planner
+    # can use the expression index.
+    return func.to_tsvector(
+        literal_column("'simple'"),
+        func.coalesce(Student.name, literal_column("''"))
+        .op('||')(literal_column("' '"))
+        .op('||')(func.coalesce(Student.registered_number, literal_column("''")))
+    )
+
+class StudentSearch:
+    @staticmethod
+    def apply(query, term):
+        """Restrict `query` to students matching `term`.
+
+        Returns `(query, rank)` where `rank` is an expression that sorts best
+        matches first in ascending order, or None when only the unranked
+        ILIKE fallback is available.
+        """
+        tokens = _tokenize(term)
+        engine = db.session.get_bind(mapper=inspect(Student))
+        dialect = engine.dialect.name
+
+        if tokens and dialect == 'postgresql':
+            return StudentSearch._apply_postgres(query, term, tokens)
+        if tokens and dialect == 'sqlite' and _has_fts_table(engine):
+            return StudentSearch._apply_sqlite(query, tokens)
+
+        pattern = f"%{term}%"
+        query = query.filter(
+            (Student.name.ilike(pattern)) |
+            (Student.registered_number.ilike(pattern))
+        )
+        return query, None
+
+    @staticmethod
+    def _apply_sqlite(query, tokens):
+        # Every token must occur somewhere in the name or registered number,
+        # as on PostgreSQL ("CS042" finds "2021CS042"). The trigram index
+        # serves tokens of three or more characters: `"ali" "cs042"`
+        fts = table(FTS_TABLE, column('student_id'), column('name'), column('registered_number'),
+                    column('rank'))
+        indexed = [token for token in tokens if len(token) >= 3]
+        conditions = []
+        if indexed:
+            expression = ' '.join(f'"{token}"' for token in indexed)
+            conditions.append(literal_column(FTS_TABLE).op('MATCH')(expression))
+        # Shorter ones filter what the index found, or scan students_fts
+        # when the whole term is short
+        for token in tokens:
+            if len(token) < 3:
+                # Tokens are \w+, so `_` is the only LIKE wildcard in them
+                pattern = '%{}%'.format(token.replace('_', '\\_'))
+                conditions.append(fts.c.name.like(pattern, escape='\\') |
+                                  fts.c.registered_number.like(pattern, escape='\\'))
+        matches = select(fts.c.student_id, fts.c.rank.label('rank')).where(*conditions).subquery()
+        query = query.join(matches, matches.c.student_id == Student.id)
+        # FTS5 `rank` is bm25(), where more negative means more relevant
+        return query, matches.c.rank
+
+    @staticmethod
+    def _apply_postgres(query, term, tokens):
+        document = _search_document()
+        ts_query = func.to_tsquery(
+            literal_column("'simple'"),
+            ' & '.join(f'{token}:*' for token in tokens)
+        )
+        pattern = f"%{term}%"
+        query = query.filter(
+            document.op('@@')(ts_query) |
+            Student.name.ilike(pattern) |
+            Student.registered_number.ilike(pattern)
+        )
+        # Negated so that ascending order puts the most relevant rows first;
+        # cast so the value survives a round trip through the page cursor.
+        return query, cast(-func.ts_rank(document, ts_query), Float)
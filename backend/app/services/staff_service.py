@@ -1,23 +1,30 @@
 from app.models.staff import Staff
 from app.models.user import User, UserRole
 from app import db
+from app.services.auth_service import AuthService
+from app.services.token_service import TokenService
+from app.utils.serialization import parse_fields, sparse_load_options, eager_load_options
 import bcrypt
 import uuid
 
 class StaffService:
     @staticmethod
-    def get_staff_members(campus_id=None, department_id=None):
-        query = Staff.query
+    def get_staff_members(campus_id=None, department_id=None, fields=None):
+        fields = parse_fields(fields, Staff.FIELDS)
+        if fields:
+            query = Staff.query.options(*sparse_load_options(Staff, fields, Staff.RELATIONS))
+        else:
+            query = Staff.query.options(*eager_load_options(Staff))
         if campus_id:
             query = query.filter_by(campus_id=campus_id)
         if department_id:
             query = query.filter_by(department_id=department_id)
         staff_members = query.all()
-        return [staff.to_dict() for staff in staff_members]
+        return [staff.to_dict(fields) for staff in staff_members]
     
     @staticmethod
     def get_staff_member(staff_id):
-        staff = Staff.query.get_or_404(staff_id)
+        staff = Staff.query.options(*eager_load_options(Staff)).get_or_404(staff_id)
         return staff.to_dict()
     
     @staticmethod
@@ -53,6 +60,7 @@ class StaffService:
         db.session.add(staff)
         
         db.session.commit()
+        AuthService.forget_unknown_emails([email])
         
         return staff.to_dict()
     
@@ -64,10 +72,14 @@ class StaffService:
             if hasattr(staff, key) and key != 'user_id':
                 setattr(staff, key, value)
                 
-        if 'email' in data and staff.user:
+        if 'email' in data and staff.user and staff.user.email != data['email']:
+            # The login changed; sessions opened under the old one end
             staff.user.email = data['email']
+            TokenService.revoke_user_tokens(staff.user_id)
         
         db.session.commit()
+        if 'email' in data:
+            AuthService.forget_unknown_emails([data['email']])
         return staff.to_dict()
     
     @staticmethod
@@ -76,6 +88,9 @@ class StaffService:
         user_id = staff.user_id
         db.session.delete(staff)
         
+        # Outstanding tokens still claim the admin role; they are rejected
+        # once the user is gone
+        TokenService.forget_user(user_id)
         UserRole.query.filter_by(user_id=user_id).delete()
         User.query.filter_by(id=user_id).delete()
         
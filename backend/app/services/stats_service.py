@@ -0,0 +1,207 @@
+from collections import Counter
+from flask import current_app, has_app_context
+from sqlalchemy import event, func, inspect
+from app import db
+from app.models.staff import Staff
+from app.models.stat_count import StatCount
+from app.models.student import Student
+from app.services.reference_cache import ReferenceCache, RELATION_TABLES
+from app.utils.upsert import increment
+
+# Group name -> column counted by it
+STUDENT_GROUPS = {
+    'campus': 'campus_id',
+    'department': 'department_id',
+    'course': 'course_id',
+    'major': 'major_id',
+    'year_of_admission': 'year_of_admission',
+    'is_alumnus': 'is_alumnus'
+}
+STAFF_GROUPS = {'department': 'department_id'}
+GROUPS = {
+    'students': (Student, STUDENT_GROUPS),
+    'staff': (Staff, STAFF_GROUPS)
+}
+_ENTITIES = {model: entity for entity, (model, _) in GROUPS.items()}
+
+def _group_key(value):
+    if value is None:
+        return ''
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    return str(value)
+
+def _group_value(group, key):
+    if key == '':
+        return None
+    if group == 'year_of_admission':
+        return int(key)
+    if group == 'is_alumnus':
+        return key == 'true'
+    return key
+
+def _new_value(model, column_name, value):
+    # Scalar column defaults (is_alumnus=False) are only filled in by the
+    # INSERT itself, after the flush hook has run
+    if value is None:
+        default = model.__table__.c[column_name].default
+        if default is not None and default.is_scalar:
+            return default.arg
+    return value
+
+class StatsService:
+    """Counts for the admin dashboard.
+
+    Every count is a SQL GROUP BY. With STATS_SUMMARY_TABLES on they are
+    read instead from `stat_counts`, which the flush hook below keeps in step
+    with every ORM insert, update and delete of a student or staff member
+    (in the same transaction). Run `flask stats rebuild` after turning it on,
+    or after writing students/staff outside the ORM.
+    """
+
+    @staticmethod
+    def summaries_enabled():
+        return has_app_context() and current_app.config.get('STATS_SUMMARY_TABLES', False)
+
+    @staticmethod
+    def get_stats():
+        """Totals plus every breakdown, for one dashboard request."""
+        counts = StatsService._all_counts()
+        references = ReferenceCache.snapshot()
+        return {
+            'totals': {
+                'students': sum(counts['students']['is_alumnus'].values()),
+                'staff': sum(counts['staff']['department'].values()),
+                'campuses': len(references.flat['campuses']),
+                'departments': len(references.flat['departments']),
+                'courses': len(references.flat['courses']),
+                'majors': len(references.flat['majors'])
+            },
+            **{
+                entity: {
+                    group: StatsService._rows(group, group_counts, references)
+                    for group, group_counts in entity_counts.items()
+                }
+                for entity, entity_counts in counts.items()
+            }
+        }
+
+    @staticmethod
+    def get_group(entity, group):
+        """One breakdown, e.g. ('students', 'campus')."""
+        if entity not in GROUPS or group not in GROUPS[entity][1]:
+            raise ValueError(f"Unknown statistic: {entity}/{group}")
+        if StatsService.summaries_enabled():
+            rows = StatCount.query.filter(
+                StatCount.dimension == f'{entity}.{group}',
+                StatCount.total != 0
+            ).all()
+            counts = {_group_value(group, row.group_key): row.total for row in rows}
+        else:
+            counts = StatsService._group_by(entity, group)
+        return StatsService._rows(group, counts, ReferenceCache.snapshot())
+
+    @staticmethod
+    def _all_counts():
+        """{entity: {group: {value: count}}} for every group in GROUPS."""
+        counts = {entity: {group: {} for group in groups} for entity, (_, groups) in GROUPS.items()}
+        if StatsService.summaries_enabled():
+            # All dimensions in one query
+            for row in StatCount.query.filter(StatCount.total != 0).all():
+                entity, _, group = row.dimension.partition('.')
+                if group in counts.get(entity, {}):
+                    counts[entity][group][_group_value(group, row.group_key)] = row.total
+            return counts
+        for entity, groups in counts.items():
+            for group in groups:
+                groups[group] = StatsService._group_by(entity, group)
+        return counts
+
+    @staticmethod
+    def _group_by(entity, group):
+        model, groups = GROUPS[entity]
+        column = getattr(model, groups[group])
+        return dict(db.session.query(column, func.count()).group_by(column).all())
+
+    @staticmethod
+    def _rows(group, counts, references):
+        # Relations carry the related name so the client needs no lookups
+        rows = []
+        for value, count in counts.items():
+            row = {'value': value, 'count': count}
+            if group in RELATION_TABLES:
+                related = references.related(group, value)
+                row['name'] = related['name'] if related else None
+            rows.append(row)
+        rows.sort(key=lambda row: (-row['count'], _group_key(row['value'])))
+        return rows
+
+    @staticmethod
+    def rebuild_summaries():
+        """Recompute `stat_counts` from scratch; returns the number of rows."""
+        rows = []
+        for entity, (_, groups) in GROUPS.items():
+            for group in groups:
+                rows.extend(
+                    {'dimension': f'{entity}.{group}', 'group_key': _group_key(value), 'total': count}
+                    for value, count in StatsService._group_by(entity, group).items()
+                )
+        db.session.execute(StatCount.__table__.delete())
+        if rows:
+            db.session.execute(StatCount.__table__.insert(), rows)
+        db.session.commit()
+        return len(rows)
+
+    @staticmethod
+    def count_inserted(session, entity, rows):
+        """Add rows written with a Core insert (which the flush hook never
+        sees) to the summaries. `rows` are the inserted column dicts."""
+        if not StatsService.summaries_enabled():
+            return
+        model, groups = GROUPS[entity]
+        deltas = Counter()
+        for row in rows:
+            for group, column_name in groups.items():
+                value = _new_value(model, column_name, row.get(column_name))
+                deltas[(f'{entity}.{group}', _group_key(value))] += 1
+        StatsService._apply(session, deltas)
+
+    @staticmethod
+    def _apply(session, deltas):
+        table = StatCount.__table__
+        for (dimension, group_key), delta in sorted(deltas.items()):
+            if delta == 0:
+                continue
+            increment(session, table, {'dimension': dimension, 'group_key': group_key}, 'total', delta)
+
+@event.listens_for(db.session, 'before_flush')
+def _count_changes(session, flush_context, instances):
+    # Same transaction as the write, like the table version bumps
+    if not StatsService.summaries_enabled():
+        return
+    deltas = Counter()
+    for sign, objects in ((1, session.new), (-1, session.deleted)):
+        for obj in objects:
+            entity = _ENTITIES.get(type(obj))
+            if entity is None:
+                continue
+            model, groups = GROUPS[entity]
+            for group, column_name in groups.items():
+                value = getattr(obj, column_name)
+                if sign > 0:
+                    value = _new_value(model, column_name, value)
+                deltas[(f'{entity}.{group}', _group_key(value))] += sign
+    for obj in session.dirty:
+        entity = _ENTITIES.get(type(obj))
+        if entity is None:
+            continue
+        state = inspect(obj)
+        for group, column_name in GROUPS[entity][1].items():
+            history = state.attrs[column_name].history
+            if not history.has_changes():
+                continue
+            for value in history.deleted:
+                deltas[(f'{entity}.{group}', _group_key(value))] -= 1
+            for value in history.added:
+                deltas[(f'{entity}.{group}', _group_key(value))] += 1
+    StatsService._apply(session, deltas)
@@ -0,0 +1,257 @@
+import csv
+import io
+import json
+import secrets
+import time
+import uuid
+from datetime import datetime
+from app import db
+from app.models.user import User, UserRole, normalize_email
+from app.models.student import Student
+from app.services.auth_service import AuthService
+from app.services.reference_cache import ReferenceCache
+from app.services.stats_service import StatsService
+from app.utils.errors import TooManyRequests
+from app.utils.passwords import hash_password, hash_passwords
+from app.utils.versioning import bump_version
+
+CHUNK_SIZE = 500
+MAX_REPORTED_ERRORS = 1000
+FORMATS = ('csv', 'ndjson')
+ENTITY_NAMES = {'campuses': 'campus', 'departments': 'department', 'courses': 'course', 'majors': 'major'}
+
+STRING_FIELDS = (
+    'name', 'registered_number', 'mobile', 'personal_email', 'emergency_contact',
+    'present_address', 'permanent_address', 'photo_url'
+)
+
+def _clean(value):
+    if isinstance(value, str):
+        value = value.strip()
+        return value or None
+    return value
+
+def _read_csv(stream):
+    text = io.TextIOWrapper(io.BufferedReader(stream), encoding='utf-8-sig', newline='')
+    for row in csv.DictReader(text):
+        yield row
+
+def _read_ndjson(stream):
+    for line in io.BufferedReader(stream):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError:
+            yield ValueError('Invalid JSON')
+            continue
+        yield row if isinstance(row, dict) else ValueError('Expected a JSON object')
+
+def _parse_bool(value):
+    if value is None or isinstance(value, bool):
+        return bool(value)
+    text = str(value).strip().lower()
+    if text in ('1', 'true', 'yes', 'y'):
+        return True
+    if text in ('0', 'false', 'no', 'n', ''):
+        return False
+    raise ValueError(f'is_alumnus must be a boolean, got {value!r}')
+
+class _ReferenceResolver:
+    """Resolves campus/department/course/major names (or ids) to ids from the
+    reference cache, scoping departments to their campus and courses to
+    their department when a name is ambiguous."""
+
+    def __init__(self, snapshot):
+        self.flat = snapshot.flat
+        self.names = {table: snapshot.ids_by_name(table) for table in snapshot.flat}
+
+    def resolve(self, table_name, value, parent_key=None, parent_id=None):
+        if value is None:
+            return None
+        if value in self.flat[table_name]:
+            return value
+        candidates = self.names[table_name].get(str(value).strip().lower(), [])
+        if len(candidates) > 1 and parent_key and parent_id:
+            candidates = [i for i in candidates if self.flat[table_name][i][parent_key] == parent_id]
+        if not candidates:
+            raise ValueError(f'Unknown {ENTITY_NAMES[table_name]} {value!r}')
+        if len(candidates) > 1:
+            raise ValueError(f'Ambiguous {ENTITY_NAMES[table_name]} {value!r}')
+        return candidates[0]
+
+class StudentImportService:
+    @staticmethod
+    def import_students(stream, fmt='csv', chunk_size=CHUNK_SIZE):
+        """Stream students from a CSV or NDJSON body into the database.
+
+        Rows are validated and resolved in chunks of `chunk_size`; each chunk
+        is written as a handful of multi-row INSERTs (users, roles, students)
+        in its own transaction; new students start with every field public,
+        which needs no privacy row. Invalid rows are reported
+        and skipped without failing the rest of the import.
+        """
+        if fmt not in FORMATS:
+            raise ValueError(f"format must be one of: {', '.join(FORMATS)}")
+        rows = _read_csv(stream) if fmt == 'csv' else _read_ndjson(stream)
+
+        report = {'total': 0, 'imported': 0, 'failed': 0, 'chunks': 0, 'errors': []}
+        state = {
+            'resolver': _ReferenceResolver(ReferenceCache.snapshot()),
+            # Imported accounts can't log in until a password is set; one hash
+            # of a random secret keeps bcrypt out of the per-row path
+            'placeholder_hash': hash_password(secrets.token_urlsafe(32)),
+            # Keys of rows already committed by this import
+            'emails': set(),
+            'registered_numbers': set()
+        }
+        started = time.perf_counter()
+
+        chunk = []
+        for row in rows:
+            report['total'] += 1
+            chunk.append((report['total'], row))
+            if len(chunk) >= chunk_size:
+                StudentImportService._import_chunk(chunk, state, report)
+                chunk = []
+        if chunk:
+            StudentImportService._import_chunk(chunk, state, report)
+
+        elapsed = time.perf_counter() - started
+        report['elapsed_seconds'] = round(elapsed, 3)
+        report['rows_per_second'] = round(report['imported'] / elapsed, 1) if elapsed else None
+        report['errors_truncated'] = report['failed'] > len(report['errors'])
+        return {'data': report}
+
+    @staticmethod
+    def _import_chunk(chunk, state, report):
+        report['chunks'] += 1
+        # Keys seen in this chunk; they join `state` once the chunk commits,
+        # so rows of a chunk that fails are not duplicates of later ones
+        pending = {'emails': set(), 'registered_numbers': set()}
+        valid = []
+        for line, row in chunk:
+            try:
+                if isinstance(row, Exception):
+                    raise row
+                valid.append((line, StudentImportService._validate(row, state, pending)))
+            except ValueError as e:
+                StudentImportService._fail(report, line, str(e))
+
+        # One query each for clashes with rows already in the database
+        emails = [normalize_email(student['email']) for _, student in valid]
+        numbers = [student['registered_number'] for _, student in valid if student['registered_number']]
+        taken_emails = {e for (e,) in db.session.query(db.func.lower(User.email)).filter(
+            db.func.lower(User.email).in_(emails))} if emails else set()
+        taken_numbers = {n for (n,) in db.session.query(Student.registered_number).filter(
+            Student.registered_number.in_(numbers))} if numbers else set()
+
+        users, roles, students, lines = [], [], [], []
+        now = datetime.utcnow()
+        for line, student in valid:
+            if normalize_email(student['email']) in taken_emails:
+                StudentImportService._fail(report, line, f"Email already registered: {student['email']}")
+                continue
+            if student['registered_number'] in taken_numbers:
+                StudentImportService._fail(report, line, f"Registered number already exists: {student['registered_number']}")
+                continue
+
+            user_id = str(uuid.uuid4())
+            users.append({
+                'id': user_id,
+                'email': student.pop('email'),
+                'password': student.pop('password'),
+                'created_at': now
+            })
+            roles.append({'id': str(uuid.uuid4()), 'user_id': user_id, 'role': 'student', 'created_at': now})
+            students.append({**student, 'id': str(uuid.uuid4()), 'user_id': user_id, 'created_at': now})
+            lines.append(line)
+
+        if not students:
+            return
+        # Rows with a password are hashed together, in the hashing pool
+        with_password = [user for user in users if user['password']]
+        try:
+            hashes = hash_passwords([user['password'] for user in with_password])
+        except TooManyRequests:
+            for line in lines:
+                StudentImportService._fail(report, line, 'Password hashing is busy, retry this row')
+            return
+        for user, hashed in zip(with_password, hashes):
+            user['password'] = hashed
+        for user in users:
+            user['password'] = user['password'] or state['placeholder_hash']
+        try:
+            db.session.execute(User.__table__.insert(), users)
+            db.session.execute(UserRole.__table__.insert(), roles)
+            db.session.execute(Student.__table__.insert(), students)
+            # Core inserts bypass the flush hooks that normally do these
+            bump_version(db.session, 'students')
+            StatsService.count_inserted(db.session, 'students', students)
+            db.session.commit()
+            AuthService.forget_unknown_emails([user['email'] for user in users])
+            state['emails'].update(normalize_email(user['email']) for user in users)
+            state['registered_numbers'].update(
+                student['registered_number'] for student in students if student['registered_number'])
+            report['imported'] += len(students)
+        except Exception as e:
+            db.session.rollback()
+            for line in lines:
+                StudentImportService._fail(report, line, f'Database error: {e.__class__.__name__}')
+
+    @staticmethod
+    def _validate(row, state, pending):
+        row = {key.strip().lower(): _clean(value) for key, value in row.items() if key}
+        nested = sorted(key for key, value in row.items() if isinstance(value, (dict, list)))
+        if nested:
+            raise ValueError(f"Expected a single value for: {', '.join(nested)}")
+        errors = []
+        if not row.get('email'):
+            errors.append('email is required')
+        if not row.get('name'):
+            errors.append('name is required')
+        if errors:
+            raise ValueError('; '.join(errors))
+
+        email = str(row['email'])
+        key = normalize_email(email)
+        if key in state['emails'] or key in pending['emails']:
+            raise ValueError(f'Duplicate email in file: {email}')
+        number = row.get('registered_number')
+        number = str(number) if number is not None else None
+        if number and (number in state['registered_numbers'] or number in pending['registered_numbers']):
+            raise ValueError(f'Duplicate registered number in file: {number}')
+
+        student = {field: (str(row[field]) if row.get(field) is not None else None) for field in STRING_FIELDS}
+        student['registered_number'] = number
+        year = row.get('year_of_admission')
+        try:
+            student['year_of_admission'] = int(year) if year is not None else None
+        except (TypeError, ValueError):
+            raise ValueError(f'year_of_admission must be an integer, got {year!r}')
+        student['is_alumnus'] = _parse_bool(row.get('is_alumnus'))
+
+        resolver = state['resolver']
+        campus_id = resolver.resolve('campuses', row.get('campus_id') or row.get('campus'))
+        department_id = resolver.resolve(
+            'departments', row.get('department_id') or row.get('department'), 'campus_id', campus_id)
+        student['campus_id'] = campus_id
+        student['department_id'] = department_id
+        student['course_id'] = resolver.resolve(
+            'courses', row.get('course_id') or row.get('course'), 'department_id', department_id)
+        student['major_id'] = resolver.resolve('majors', row.get('major_id') or row.get('major'))
+
+        student['email'] = email
+        password = row.get('password')
+        student['password'] = str(password) if password is not None else None
+        pending['emails'].add(key)
+        if number:
+            pending['registered_numbers'].add(number)
+        return student
+
+    @staticmethod
+    def _fail(report, line, message):
+        report['failed'] += 1
+        if len(report['errors']) < MAX_REPORTED_ERRORS:
+            report['errors'].append({'row': line, 'error': message})
@@ -1,18 +1,29 @@
+import csv
+import io
+import json
 from app.models.student import Student
 from app import db
+from sqlalchemy import false
 from sqlalchemy.orm import joinedload
-from app.models.privacy_setting import PrivacySetting
+from app.services.privacy_setting_service import PrivacySettingService
+from app.services.reference_cache import ReferenceCache
+from app.services.search_service import SEARCH_FIELDS, StudentSearch
+from app.services.token_service import TokenService
+from app.utils.pagination import wants_pagination, parse_limit, paginate_keyset
+from app.utils.serialization import parse_shape, parse_fields, sparse_load_options
+
+EXPORT_FORMATS = ('csv', 'ndjson')
+EXPORT_BATCH_SIZE = 500
+EXPORT_FIELDS = Student.FLAT_FIELDS + Student.RELATIONS
 
 class StudentService:
     @staticmethod
-    def get_students(filters=None):
-        query = Student.query.options(
-            joinedload(Student.department),
-            joinedload(Student.major),
-            joinedload(Student.course),
-            joinedload(Student.campus)
-        )
-        
+    def get_students(filters=None, viewer=None):
+        query = StudentService._apply_filters(StudentService._list_query(filters), filters)
+        return StudentService._list_students(query, filters, viewer=viewer)
+    
+    @staticmethod
+    def _apply_filters(query, filters=None):
         if filters:
             if 'campus_id' in filters:
                 query = query.filter_by(campus_id=filters['campus_id'])
@@ -24,33 +35,81 @@ class StudentService:
                 query = query.filter_by(major_id=filters['major_id'])
             if 'is_alumnus' in filters:
                 query = query.filter_by(is_alumnus=filters['is_alumnus'])
+        return query
+    
+    @staticmethod
+    def export_students(filters=None, fmt='csv'):
+        """Return a generator of text chunks exporting every student that
+        matches `filters` (same filters as get_students).
+        
+        Rows are streamed from a server-side cursor in batches of
+        EXPORT_BATCH_SIZE and related names come from the reference cache, so
+        memory use does not grow with the size of the directory.
+        """
+        if fmt not in EXPORT_FORMATS:
+            raise ValueError(f"format must be one of: {', '.join(EXPORT_FORMATS)}")
+        query = StudentService._apply_filters(Student.query, filters)
+        query = query.order_by(Student.name, Student.id).yield_per(EXPORT_BATCH_SIZE)
+        references = ReferenceCache.snapshot()
+        
+        def rows():
+            for student in query:
+                row = student.to_flat_dict()
+                for relation in Student.RELATIONS:
+                    related = references.related(relation, row[f'{relation}_id'])
+                    row[relation] = related['name'] if related else None
+                yield row
         
-        students = query.all()
-        return [student.to_dict() for student in students]
+        if fmt == 'ndjson':
+            return StudentService._export_ndjson(rows())
+        return StudentService._export_csv(rows())
+    
+    @staticmethod
+    def _export_csv(rows):
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=EXPORT_FIELDS, extrasaction='ignore')
+        writer.writeheader()
+        # Send the header straight away, then one chunk per batch
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+        for count, row in enumerate(rows, 1):
+            writer.writerow(row)
+            if count % EXPORT_BATCH_SIZE == 0:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+        if buffer.tell():
+            yield buffer.getvalue()
     
     @staticmethod
-    def get_student(student_id):
+    def _export_ndjson(rows):
+        lines = []
+        for row in rows:
+            lines.append(json.dumps(row) + '\n')
+            if len(lines) >= EXPORT_BATCH_SIZE:
+                yield ''.join(lines)
+                lines = []
+        if lines:
+            yield ''.join(lines)
+    
+    @staticmethod
+    def get_student(student_id, viewer=None):
         student = Student.query.options(
             joinedload(Student.department),
             joinedload(Student.major),
             joinedload(Student.course),
             joinedload(Student.campus)
         ).get_or_404(student_id)
-        return student.to_dict()
+        data = student.to_dict()
+        StudentService._apply_privacy([student], [data], viewer)
+        return data
     
     @staticmethod
     def create_student(data):
         student = Student(**data)
         db.session.add(student)
-        db.session.commit()
-        # Create default privacy settings for the new student
-        FIELDS = [
-            "name", "registered_number", "year_of_admission", "mobile", "personal_email",
-            "emergency_contact", "present_address", "permanent_address", "photo_url"
-        ]
-        for field in FIELDS:
-            setting = PrivacySetting(user_id=student.user_id, field_name=field, is_private=False)
-            db.session.add(setting)
+        # Every field starts public, which needs no privacy row at all
         db.session.commit()
         return student.to_dict()
     
@@ -68,18 +127,16 @@ class StudentService:
     @staticmethod
     def delete_student(student_id):
         student = Student.query.get_or_404(student_id)
+        # The user account stays, but its tokens should not outlive the profile
+        TokenService.revoke_user_tokens(student.user_id)
         db.session.delete(student)
         db.session.commit()
         return {'message': 'Student deleted successfully'}
     
     @staticmethod
-    def search_students(criteria=None):
-        query = Student.query.options(
-            joinedload(Student.department),
-            joinedload(Student.major),
-            joinedload(Student.course),
-            joinedload(Student.campus)
-        )
+    def search_students(criteria=None, viewer=None):
+        query = StudentService._list_query(criteria)
+        rank = None
         if criteria:
             if 'campus_id' in criteria and criteria['campus_id']:
                 query = query.filter_by(campus_id=criteria['campus_id'])
@@ -89,16 +146,112 @@ class StudentService:
                 query = query.filter_by(course_id=criteria['course_id'])
             if 'major_id' in criteria and criteria['major_id']:
                 query = query.filter_by(major_id=criteria['major_id'])
-            if 'search_term' in criteria and criteria['search_term']:
-                term = f"%{criteria['search_term']}%"
-                query = query.filter(
-                    (Student.name.ilike(term)) |
-                    (Student.registered_number.ilike(term))
-                )
         # Exclude alumni/removed students
         if hasattr(Student, 'is_alumnus'):
-            query = query.filter_by(is_alumnus=False)
+            # Literal false so idx_students_current_name_id applies
+            query = query.filter(Student.is_alumnus == false())
         if hasattr(Student, 'removed'):
             query = query.filter_by(removed=False)
-        students = query.all()
-        return [student.to_dict() for student in students] 
\ No newline at end of file
+        # Applied last: the search backend may join a match table
+        if criteria and criteria.get('search_term'):
+            # Otherwise matching a term would reveal a private name
+            visible = PrivacySettingService.visible_filter(SEARCH_FIELDS, viewer)
+            if visible is not None:
+                query = query.filter(visible)
+            query, rank = StudentSearch.apply(query, criteria['search_term'])
+        # Ranked searches are ordered by relevance, everything else by name
+        sort_keys = [rank, Student.id] if rank is not None else None
+        return StudentService._list_students(query, criteria, sort_keys, viewer)
+    
+    @staticmethod
+    def _list_fields(params=None):
+        allowed = Student.FLAT_FIELDS if parse_shape(params) == 'flat' else Student.FIELDS
+        return parse_fields((params or {}).get('fields'), allowed)
+    
+    @staticmethod
+    def _list_query(params=None):
+        # Related objects come from the reference cache, so list queries only
+        # ever touch the students table
+        fields = StudentService._list_fields(params)
+        if fields:
+            # Only SELECT the requested columns (relations need their FK column,
+            # privacy masking needs user_id)
+            columns = [f'{field}_id' if field in Student.RELATIONS else field for field in fields]
+            if 'user_id' not in columns:
+                columns.append('user_id')
+            return Student.query.options(*sparse_load_options(Student, columns))
+        return Student.query
+    
+    @staticmethod
+    def _list_students(query, params=None, sort_keys=None, viewer=None):
+        # Keyset pagination is opt-in: clients that send `limit` or `cursor`
+        # get a bounded page ordered by `sort_keys` plus a `next_cursor`.
+        next_cursor = None
+        if not wants_pagination(params):
+            if sort_keys:
+                query = query.order_by(*sort_keys)
+            students = query.all()
+        else:
+            students, next_cursor = paginate_keyset(
+                query,
+                sort_keys or [Student.name, Student.id],
+                parse_limit(params.get('limit')),
+                params.get('cursor')
+            )
+        
+        fields = StudentService._list_fields(params)
+        references = ReferenceCache.snapshot()
+        if parse_shape(params) == 'flat':
+            data = [student.to_flat_dict(fields) for student in students]
+            StudentService._apply_privacy(students, data, viewer)
+            return {
+                'data': data,
+                'included': StudentService._included(students, references, fields),
+                'next_cursor': next_cursor
+            }
+        data = [student.to_dict(fields, references) for student in students]
+        StudentService._apply_privacy(students, data, viewer)
+        return {'data': data, 'next_cursor': next_cursor}
+    
+    @staticmethod
+    def _apply_privacy(students, data, viewer=None):
+        """Blank out fields each student marked private, in place.
+        
+        Admins and students viewing their own record see everything. Settings
+        for the whole page are loaded at once; masked rows list the hidden
+        fields under `private_fields`.
+        """
+        if viewer and viewer.get('role') == 'admin':
+            return
+        viewer_id = viewer.get('user_id') if viewer else None
+        user_ids = {student.user_id for student in students if student.user_id != viewer_id}
+        if not user_ids:
+            return
+        private = PrivacySettingService.get_private_fields(user_ids)
+        for student, row in zip(students, data):
+            hidden = [field for field in private.get(student.user_id, ()) if field in row]
+            if student.user_id == viewer_id or not hidden:
+                continue
+            for field in hidden:
+                row[field] = None
+            row['private_fields'] = sorted(hidden)
+    
+    @staticmethod
+    def _included(students, references, fields=None):
+        """Every campus, department, course and major referenced by `students`
+        (directly or through a course/department), each exactly once.
+        
+        With a sparse fieldset only the foreign keys that were selected are
+        followed; the others were never loaded.
+        """
+        def referenced(key):
+            if fields is not None and key not in fields:
+                return set()
+            return {getattr(s, key) for s in students if getattr(s, key)}
+        
+        return references.included(
+            campus_ids=referenced('campus_id'),
+            department_ids=referenced('department_id'),
+            course_ids=referenced('course_id'),
+            major_ids=referenced('major_id')
+        )
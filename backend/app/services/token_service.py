@@ -0,0 +1,82 @@
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from flask import current_app
+from flask_jwt_extended import create_access_token
+from app import db, jwt
+from app.models.user import TokenVersion, User
+from app.utils.upsert import increment
+
+# user_id -> (version, expires_at), least recently used first; see
+# TokenService.current_version
+_version_cache = OrderedDict()
+_version_cache_lock = threading.Lock()
+# Reported for users that no longer exist, so all of their tokens are revoked
+DELETED_USER_VERSION = float('inf')
+
+class TokenService:
+    @staticmethod
+    def create_token(user_id, role):
+        """Mint an access token carrying the user's role and token version as
+        signed claims, so authorization needs no database lookup."""
+        return create_access_token(
+            identity=user_id,
+            additional_claims={
+                'role': role,
+                'tv': TokenService.current_version(user_id, use_cache=False)
+            }
+        )
+    
+    @staticmethod
+    def current_version(user_id, use_cache=True):
+        now = time.monotonic()
+        with _version_cache_lock:
+            cached = _version_cache.get(user_id)
+            if use_cache and cached and cached[1] > now:
+                _version_cache.move_to_end(user_id)
+                return cached[0]
+        
+        row = db.session.query(User.id, TokenVersion.version).outerjoin(
+            TokenVersion, TokenVersion.user_id == User.id
+        ).filter(User.id == user_id).first()
+        if row is None:
+            version = DELETED_USER_VERSION
+        else:
+            version = row.version or 0
+        config = current_app.config
+        with _version_cache_lock:
+            _version_cache.pop(user_id, None)
+            _version_cache[user_id] = (version, now + config.get('JWT_TOKEN_VERSION_CACHE_SECONDS', 5))
+            while len(_version_cache) > config.get('JWT_TOKEN_VERSION_CACHE_SIZE', 10000):
+                _version_cache.popitem(last=False)
+        return version
+    
+    @staticmethod
+    def revoke_user_tokens(user_id):
+        """Invalidate every token issued to `user_id` so far. Called when a
+        student profile is deleted, a staff login email changes and by
+        POST /api/auth/users/<id>/revoke-tokens; anything that changes a
+        role or password must call it too. This worker rejects the tokens at
+        once, other workers within JWT_TOKEN_VERSION_CACHE_SECONDS. The
+        caller commits."""
+        increment(db.session, TokenVersion.__table__, {'user_id': user_id}, 'version',
+                  updated_at=datetime.utcnow())
+        with _version_cache_lock:
+            _version_cache.pop(user_id, None)
+    
+    @staticmethod
+    def forget_user(user_id):
+        """Drop `user_id`'s version row ahead of deleting the user (it
+        references users.id). Tokens of a user that no longer exists are
+        revoked anyway, see current_version. The caller commits."""
+        TokenVersion.query.filter_by(user_id=user_id).delete()
+        with _version_cache_lock:
+            _version_cache.pop(user_id, None)
+
+@jwt.token_in_blocklist_loader
+def is_token_revoked(jwt_header, jwt_payload):
+    # Tokens minted before versions were embedded simply run out their expiry
+    if 'tv' not in jwt_payload:
+        return False
+    return jwt_payload['tv'] < TokenService.current_version(jwt_payload['sub'])
@@ -0,0 +1,122 @@
+import zlib
+from flask import request
+from app.utils.metrics import metrics
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+class _Gzip:
+    def __init__(self, level):
+        # wbits=31: zlib stream with a gzip header and trailer
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, data):
+        return self._compressor.compress(data)
+
+    def flush(self):
+        return self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self):
+        return self._compressor.flush(zlib.Z_FINISH)
+
+class _Brotli:
+    def __init__(self, level):
+        self._compressor = brotli.Compressor(quality=level)
+
+    def compress(self, data):
+        return self._compressor.process(data)
+
+    def flush(self):
+        return self._compressor.flush()
+
+    def finish(self):
+        return self._compressor.finish()
+
+class _Zstd:
+    def __init__(self, level):
+        self._compressor = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data):
+        return self._compressor.compress(data)
+
+    def flush(self):
+        return self._compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def finish(self):
+        return self._compressor.flush(zstandard.COMPRESSOBJ_FLUSH_FINISH)
+
+# Content-Encoding -> (compressor class, level setting); encodings whose
+# library is missing are never offered
+ENCODERS = {'gzip': (_Gzip, 'COMPRESSION_GZIP_LEVEL')}
+if brotli is not None:
+    ENCODERS['br'] = (_Brotli, 'COMPRESSION_BR_LEVEL')
+if zstandard is not None:
+    ENCODERS['zstd'] = (_Zstd, 'COMPRESSION_ZSTD_LEVEL')
+
+def _compress_stream(chunks, compressor, charset='utf-8'):
+    # Flushing after every chunk lets the client see each one as it is
+    # produced (e.g. the CSV header straight away) instead of whenever the
+    # compressor's buffer fills
+    try:
+        for chunk in chunks:
+            if isinstance(chunk, str):
+                chunk = chunk.encode(charset)
+            data = compressor.compress(chunk) + compressor.flush()
+            if data:
+                yield data
+        yield compressor.finish()
+    finally:
+        close = getattr(chunks, 'close', None)
+        if close is not None:
+            close()
+
+def init_compression(app):
+    """Compress responses with the best encoding the client accepts among
+    COMPRESSION_ENCODINGS (server preference order).
+
+    Buffered bodies shorter than COMPRESSION_MIN_SIZE are sent as they are.
+    Streamed bodies (exports) are always compressed, one chunk at a time,
+    without buffering them. The ETags set by the conditional GET layer are
+    weak, so they stay valid for every encoding.
+    """
+    encodings = [name for name in app.config['COMPRESSION_ENCODINGS'] if name in ENCODERS]
+    if not encodings:
+        return
+    mimetypes = set(app.config['COMPRESSION_MIMETYPES'])
+    min_size = app.config['COMPRESSION_MIN_SIZE']
+
+    @app.after_request
+    def compress_response(response):
+        if response.mimetype not in mimetypes:
+            return response
+        response.vary.add('Accept-Encoding')
+        if (response.status_code < 200 or response.status_code in (204, 304)
+                or response.direct_passthrough
+                or 'Content-Encoding' in response.headers
+                or 'no-transform' in (response.headers.get('Cache-Control') or '')):
+            return response
+
+        encoding = request.accept_encodings.best_match(encodings)
+        if encoding is None:
+            return response
+        compressor_class, level_setting = ENCODERS[encoding]
+        compressor = compressor_class(app.config[level_setting])
+
+        if response.is_streamed:
+            response.response = _compress_stream(response.response, compressor)
+            response.headers.pop('Content-Length', None)
+        else:
+            data = response.get_data()
+            if len(data) < min_size:
+                return response
+            response.set_data(compressor.compress(data) + compressor.finish())
+        response.headers['Content-Encoding'] = encoding
+        metrics.inc(f'compression.{encoding}')
+        return response
@@ -0,0 +1,55 @@
+import hashlib
+from functools import wraps
+from flask import g, request, make_response
+from app.utils.decorators import get_current_viewer
+from app.utils.versioning import track_tables, get_versions
+
+def depends_on(*table_names):
+    """Mark a GET view as depending only on `table_names`.
+
+    The view's ETag is derived from those tables' versions, so a matching
+    If-None-Match is answered with 304 before the view (and its queries)
+    run at all. Apply it below the auth decorators: a 304 is only sent to
+    callers allowed to see the response.
+    """
+    track_tables(*table_names)
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            if request.method != 'GET':
+                return f(*args, **kwargs)
+            etag = compute_etag(table_names)
+            g.etag = etag
+            if request.if_none_match.contains_weak(etag):
+                response = make_response('', 304)
+                response.set_etag(etag, weak=True)
+                response.headers['Cache-Control'] = 'no-cache'
+                response.vary.add('Authorization')
+                return response
+            return f(*args, **kwargs)
+        return decorated_function
+    return decorator
+
+def compute_etag(table_names):
+    versions = get_versions(table_names)
+    parts = [request.full_path]
+    parts.extend(f'{name}:{versions[name]}' for name in sorted(versions))
+    # Responses may differ per caller (privacy settings, future masking).
+    # The verified caller, not the header: an expired or revoked token
+    # counts as anonymous and no longer matches its old tags
+    viewer = get_current_viewer()
+    parts.append(f"{viewer['user_id']}:{viewer['role']}" if viewer else '')
+    return hashlib.sha1('|'.join(parts).encode('utf-8')).hexdigest()
+
+def init_conditional_get(app):
+    @app.after_request
+    def add_etag(response):
+        etag = g.get('etag')
+        if etag and response.status_code == 200:
+            # Weak: the tag identifies the data, not the bytes, which differ
+            # per Content-Encoding
+            response.set_etag(etag, weak=True)
+            # Always revalidate; a revalidation costs one version lookup
+            response.headers['Cache-Control'] = 'no-cache'
+            response.vary.add('Authorization')
+        return response
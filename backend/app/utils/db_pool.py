@@ -0,0 +1,101 @@
+import time
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import TimeoutError as PoolTimeout
+from sqlalchemy.pool import NullPool, QueuePool
+from app.utils.metrics import metrics
+
+POOL_PROFILES = ('default', 'pgbouncer')
+
+class MeteredQueuePool(QueuePool):
+    """QueuePool that reports checkout waits and occupancy to the metrics
+    registry, so pool size and overflow can be sized from real traffic.
+
+    `db_pool.wait_seconds` times every checkout (near zero unless the pool
+    is exhausted), `db_pool.timeouts` counts checkouts that gave up after
+    DB_POOL_TIMEOUT, and the gauges show the state after the last change.
+    """
+
+    metrics_prefix = 'db_pool'
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeout:
+            metrics.inc(f'{self.metrics_prefix}.timeouts')
+            raise
+        finally:
+            metrics.observe(f'{self.metrics_prefix}.wait_seconds', time.perf_counter() - started)
+            self._report()
+
+    def _do_return_conn(self, record):
+        super()._do_return_conn(record)
+        self._report()
+
+    def _report(self):
+        metrics.set_gauge(f'{self.metrics_prefix}.size', self.size())
+        metrics.set_gauge(f'{self.metrics_prefix}.checked_out', self.checkedout())
+        metrics.set_gauge(f'{self.metrics_prefix}.idle', self.checkedin())
+        metrics.set_gauge(f'{self.metrics_prefix}.overflow', max(0, self.overflow()))
+
+@event.listens_for(MeteredQueuePool, 'connect')
+def _count_connect(dbapi_connection, connection_record):
+    metrics.inc('db_pool.connects')
+
+@event.listens_for(MeteredQueuePool, 'invalidate')
+def _count_invalidate(dbapi_connection, connection_record, exception):
+    # Includes connections pre-ping found dead
+    metrics.inc('db_pool.invalidated')
+
+_pool_classes = {'db_pool': MeteredQueuePool}
+
+def _metered_pool_class(prefix):
+    # One subclass per engine so replicas report their own gauges
+    if prefix not in _pool_classes:
+        _pool_classes[prefix] = type('MeteredQueuePool', (MeteredQueuePool,), {'metrics_prefix': prefix})
+    return _pool_classes[prefix]
+
+def build_engine_options(config, url=None, metrics_prefix='db_pool'):
+    """Engine options for the DB_POOL_* settings in `config`, for `url`
+    (default SQLALCHEMY_DATABASE_URI)."""
+    profile = config['DB_POOL_PROFILE']
+    if profile not in POOL_PROFILES:
+        raise ValueError(f"DB_POOL_PROFILE must be one of: {', '.join(POOL_PROFILES)}")
+
+    url = make_url(url or config['SQLALCHEMY_DATABASE_URI'])
+    options = {
+        'pool_pre_ping': config['DB_POOL_PRE_PING'],
+        'pool_recycle': config['DB_POOL_RECYCLE']
+    }
+    if url.get_backend_name() == 'sqlite' and url.database in (None, '', ':memory:'):
+        # In-memory SQLite lives in one connection; Flask-SQLAlchemy pins it
+        return options
+    if config['DB_POOL_DISABLED']:
+        options['poolclass'] = NullPool
+    else:
+        options.update({
+            'poolclass': _metered_pool_class(metrics_prefix),
+            'pool_size': config['DB_POOL_SIZE'],
+            'max_overflow': config['DB_MAX_OVERFLOW'],
+            'pool_timeout': config['DB_POOL_TIMEOUT'],
+            'pool_use_lifo': config['DB_POOL_USE_LIFO']
+        })
+
+    if profile == 'pgbouncer' and url.get_backend_name() == 'postgresql':
+        # Transaction pooling hands each transaction to whichever server
+        # connection is free, so a statement prepared on one is missing on
+        # the next. psycopg2 never prepares server-side; psycopg 3 does after
+        # a few executions unless told not to.
+        if url.get_driver_name() == 'psycopg':
+            options['connect_args'] = {'prepare_threshold': None}
+    return options
+
+def dispose_inherited_engines(app, db):
+    """Drop pooled connections a forked worker inherited from its parent
+    (gunicorn --preload). Sharing a socket between processes corrupts the
+    protocol stream, so each worker opens its own; `close=False` leaves
+    them open for the parent."""
+    with app.app_context():
+        for engine in db.engines.values():
+            engine.dispose(close=False)
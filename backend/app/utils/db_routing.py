@@ -0,0 +1,146 @@
+import random
+import threading
+import time
+from flask import g, has_request_context, request
+from flask_sqlalchemy.session import Session
+from sqlalchemy import text
+from sqlalchemy.sql import Select
+from app.utils.metrics import metrics
+
+REPLICA_BIND_PREFIX = 'replica_'
+READ_METHODS = ('GET', 'HEAD')
+
+# Seconds behind the primary; 0 when the replica has replayed everything it
+# has received, so an idle primary does not look like lag
+POSTGRES_LAG_SQL = text(
+    "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) END"
+)
+
+def replica_bind_keys(engines):
+    return sorted(key for key in engines if key and key.startswith(REPLICA_BIND_PREFIX))
+
+def use_primary(f):
+    """Keep a GET view on the primary (it writes, or must not see lag)."""
+    f.db_route = 'primary'
+    return f
+
+def read_only(f):
+    """Let a non-GET view that only reads (e.g. POST search) use a replica."""
+    f.db_route = 'replica'
+    return f
+
+class RoutingSession(Session):
+    """Sends plain SELECTs to the replica chosen for the current request and
+    everything else (flushes, Core INSERT/UPDATE/DELETE, SELECT .. FOR
+    UPDATE, text()) to the primary. Once a request writes, its remaining
+    reads go to the primary too."""
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and has_request_context():
+            replica = g.get('db_replica')
+            if replica is not None and not g.get('db_wrote'):
+                if not self._flushing and isinstance(clause, Select) and clause._for_update_arg is None:
+                    return self._db.engines[replica]
+            if self._flushing or (clause is not None and not isinstance(clause, Select)):
+                g.db_wrote = True
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+class ReplicaMonitor:
+    """Measures each replica's lag at most every DB_REPLICA_LAG_CHECK_SECONDS
+    (per worker) and reports which ones are within DB_REPLICA_MAX_LAG_SECONDS.
+
+    A replica whose probe fails counts as unhealthy until the next probe.
+    Lag is exported as the `db_replica.<bind>.lag_seconds` gauge.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._state = {}
+
+    def healthy(self, db, config):
+        now = time.monotonic()
+        healthy = []
+        for key in replica_bind_keys(db.engines):
+            checked_at, lag = self._state.get(key, (None, None))
+            if checked_at is None or now - checked_at >= config['DB_REPLICA_LAG_CHECK_SECONDS']:
+                with self._lock:
+                    checked_at, lag = self._state.get(key, (None, None))
+                    if checked_at is None or now - checked_at >= config['DB_REPLICA_LAG_CHECK_SECONDS']:
+                        lag = self._probe(db.engines[key])
+                        self._state[key] = (now, lag)
+                        metrics.set_gauge(f'db_replica.{key}.lag_seconds', lag)
+            if lag is not None and lag <= config['DB_REPLICA_MAX_LAG_SECONDS']:
+                healthy.append(key)
+        return healthy
+
+    def _probe(self, engine):
+        try:
+            with engine.connect() as connection:
+                if engine.dialect.name == 'postgresql':
+                    return float(connection.execute(POSTGRES_LAG_SQL).scalar() or 0)
+                # Other dialects have no replication lag to ask about
+                connection.execute(text('SELECT 1'))
+                return 0.0
+        except Exception:
+            metrics.inc('db_replica.probe_errors')
+            return None
+
+    def reset(self):
+        with self._lock:
+            self._state.clear()
+
+monitor = ReplicaMonitor()
+
+def _sticky_key(user_id):
+    return f'db:sticky:{user_id}'
+
+def note_writer(user_id):
+    """Attribute this request's writes to `user_id` when the request itself
+    is anonymous (e.g. registration), so their first reads stay consistent."""
+    if has_request_context():
+        g.db_writer_id = user_id
+
+def init_db_routing(app, db):
+    """Route read-only requests to the DATABASE_REPLICA_URLS binds.
+
+    GET/HEAD views (unless marked @use_primary) and views marked
+    @read_only read from a healthy replica. A user whose request wrote to
+    the primary keeps reading from the primary for DB_REPLICA_STICKY_SECONDS,
+    so a change is visible on their next reload; the marker is kept in the
+    rate-limit backend (share it via RATE_LIMIT_STORAGE_URL across workers).
+    """
+    if not app.config.get('DATABASE_REPLICA_URLS'):
+        return
+    from app.utils.decorators import get_current_viewer
+    from app.utils.rate_limit import get_backend
+
+    @app.before_request
+    def choose_database():
+        view = app.view_functions.get(request.endpoint)
+        route = getattr(view, 'db_route', None)
+        if route == 'primary' or (route is None and request.method not in READ_METHODS):
+            return None
+
+        viewer = get_current_viewer()
+        g.db_viewer = viewer
+        if viewer and get_backend().get(_sticky_key(viewer['user_id'])) is not None:
+            metrics.inc('db_route.sticky')
+            return None
+
+        replicas = monitor.healthy(db, app.config)
+        if not replicas:
+            metrics.inc('db_route.fallback')
+            return None
+        g.db_replica = random.choice(replicas)
+        metrics.inc('db_route.replica')
+        return None
+
+    @app.after_request
+    def remember_writer(response):
+        if g.get('db_wrote') and response.status_code < 400:
+            viewer = g.db_viewer if 'db_viewer' in g else get_current_viewer()
+            user_id = viewer['user_id'] if viewer else g.get('db_writer_id')
+            if user_id:
+                get_backend().set(_sticky_key(user_id), '1', app.config['DB_REPLICA_STICKY_SECONDS'])
+        return response
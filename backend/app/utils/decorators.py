@@ -1,7 +1,10 @@
 from functools import wraps
 from flask import jsonify, request
-from flask_jwt_extended import verify_jwt_in_request, get_jwt_identity
+from flask_jwt_extended import verify_jwt_in_request, get_jwt_identity, get_jwt
+from flask_jwt_extended.exceptions import JWTExtendedException
+from jwt.exceptions import PyJWTError
 from app.models.user import UserRole
+from app.utils.errors import TooManyRequests
 
 def handle_exceptions(f):
     @wraps(f)
@@ -13,6 +16,11 @@ def handle_exceptions(f):
                 'error': str(e),
                 'status': 'error'
             }), 400
+        except TooManyRequests as e:
+            return jsonify({
+                'error': str(e),
+                'status': 'error'
+            }), 429, {'Retry-After': str(e.retry_after)}
         except Exception as e:
             return jsonify({
                 'error': str(e),
@@ -32,10 +40,14 @@ def require_role(roles):
         @wraps(f)
         def decorated_function(*args, **kwargs):
             verify_jwt_in_request()
-            user_id = get_jwt_identity()
-            user_role = UserRole.query.filter_by(user_id=user_id).first()
+            # The role is a signed claim; only tokens minted before roles
+            # were embedded need the database lookup
+            role = get_jwt().get('role')
+            if role is None:
+                user_role = UserRole.query.filter_by(user_id=get_jwt_identity()).first()
+                role = user_role.role if user_role else None
             
-            if not user_role or user_role.role not in roles:
+            if role not in roles:
                 return jsonify({
                     'error': 'Unauthorized access',
                     'status': 'error'
@@ -49,4 +61,19 @@ def admin_required(f):
     return require_role(['admin'])(f)
 
 def login_required(f):
-    return require_auth(f) 
\ No newline at end of file
+    return require_auth(f) 
+
+def get_current_viewer():
+    """Identify the caller of a public endpoint, if they sent a token.
+
+    Returns {'user_id': ..., 'role': ...} or None for anonymous callers. An
+    invalid or expired token is treated as anonymous rather than an error.
+    """
+    try:
+        verify_jwt_in_request(optional=True)
+    except (JWTExtendedException, PyJWTError):
+        return None
+    user_id = get_jwt_identity()
+    if user_id is None:
+        return None
+    return {'user_id': user_id, 'role': get_jwt().get('role')}
\ No newline at end of file
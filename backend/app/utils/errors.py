@@ -0,0 +1,7 @@
+class TooManyRequests(Exception):
+    """Raised when a shared resource is saturated; handle_exceptions turns it
+    into a 429 with a Retry-After header."""
+
+    def __init__(self, message='Too many requests, please retry later', retry_after=1):
+        super().__init__(message)
+        self.retry_after = max(1, int(retry_after))
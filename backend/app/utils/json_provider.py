@@ -0,0 +1,68 @@
+from datetime import date
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+JSON_PROVIDERS = ('auto', 'orjson', 'stdlib')
+
+class StdlibJSONProvider(DefaultJSONProvider):
+    """Flask's provider with two changes: dates and datetimes encode as
+    ISO 8601, the same as to_dict() writes them (Flask defaults to HTTP
+    dates), and objects with a to_dict() (model rows) can be passed to
+    jsonify. Those are still converted with to_dict() first, so it is a
+    convenience, not a faster path."""
+
+    @staticmethod
+    def default(o):
+        if isinstance(o, date):
+            return o.isoformat()
+        to_dict = getattr(o, 'to_dict', None)
+        if to_dict is not None:
+            return to_dict()
+        return DefaultJSONProvider.default(o)
+
+class OrjsonProvider(StdlibJSONProvider):
+    """Encodes and decodes with orjson, which handles datetimes, UUIDs and
+    dataclasses natively and writes bytes straight into the response.
+    Model rows still go through to_dict(): privacy masking and sparse
+    fieldsets edit those dicts before they are encoded."""
+
+    def _encode(self, obj, indent=False):
+        option = orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=self.default, option=option)
+
+    def dumps(self, obj, **kwargs):
+        indent = kwargs.pop('indent', None)
+        if kwargs or indent not in (None, 2):
+            # orjson has no equivalent for these; encode like Flask would
+            return super().dumps(obj, indent=indent, **kwargs)
+        return self._encode(obj, indent == 2).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = (self.compact is None and self._app.debug) or self.compact is False
+        return self._app.response_class(self._encode(obj, indent) + b'\n', mimetype=self.mimetype)
+
+def make_json_provider(app):
+    """The provider selected by JSON_PROVIDER: 'orjson', 'stdlib' or 'auto'
+    (orjson when installed)."""
+    choice = app.config['JSON_PROVIDER']
+    if choice not in JSON_PROVIDERS:
+        raise ValueError(f"JSON_PROVIDER must be one of: {', '.join(JSON_PROVIDERS)}")
+    if choice == 'orjson' and orjson is None:
+        raise ValueError('JSON_PROVIDER=orjson needs the orjson package')
+    if choice == 'stdlib' or orjson is None:
+        return StdlibJSONProvider(app)
+    return OrjsonProvider(app)
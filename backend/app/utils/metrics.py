@@ -0,0 +1,59 @@
+import threading
+
+class MetricsRegistry:
+    """In-process counters, gauges and timings.
+
+    Values are per worker process; `snapshot()` is what GET /api/metrics
+    returns.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters = {}
+        self._gauges = {}
+        self._timings = {}
+
+    def inc(self, name, amount=1):
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + amount
+
+    def set_gauge(self, name, value):
+        with self._lock:
+            self._gauges[name] = value
+
+    def observe(self, name, seconds):
+        with self._lock:
+            timing = self._timings.setdefault(name, {'count': 0, 'total': 0.0, 'max': 0.0})
+            timing['count'] += 1
+            timing['total'] += seconds
+            timing['max'] = max(timing['max'], seconds)
+
+    def average(self, name, default=None):
+        with self._lock:
+            timing = self._timings.get(name)
+            if not timing or not timing['count']:
+                return default
+            return timing['total'] / timing['count']
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                'counters': dict(self._counters),
+                'gauges': dict(self._gauges),
+                'timings': {
+                    name: {
+                        'count': timing['count'],
+                        'avg_seconds': round(timing['total'] / timing['count'], 6) if timing['count'] else None,
+                        'max_seconds': round(timing['max'], 6)
+                    }
+                    for name, timing in self._timings.items()
+                }
+            }
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+            self._gauges.clear()
+            self._timings.clear()
+
+metrics = MetricsRegistry()
@@ -0,0 +1,30 @@
+import click
+
+class _LazyMigrateGroup(click.Group):
+    """`flask db`, resolved on first use. Importing Flask-Migrate pulls in
+    alembic, which only the CLI needs; web workers never import it."""
+
+    def __init__(self, app, db):
+        super().__init__(name='db', help='Perform database migrations.')
+        self._app = app
+        self._db = db
+        self._group = None
+
+    def _load(self):
+        if self._group is None:
+            from flask_migrate import Migrate
+            from flask_migrate.cli import db as db_group
+            # Registers app.extensions['migrate'] for migrations/env.py
+            Migrate(self._app, self._db)
+            self._group = db_group
+        return self._group
+
+    def list_commands(self, ctx):
+        return self._load().list_commands(ctx)
+
+    def get_command(self, ctx, name):
+        return self._load().get_command(ctx, name)
+
+def init_migrations(app, db):
+    """Same commands and settings as `Migrate(app, db)`."""
+    app.cli.add_command(_LazyMigrateGroup(app, db))
@@ -0,0 +1,156 @@
+import math
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeout
+from concurrent.futures.process import BrokenProcessPool
+import bcrypt
+from flask import current_app, has_app_context
+from app.utils.errors import TooManyRequests
+from app.utils.metrics import metrics
+
+DEFAULT_ROUNDS = 12
+DEFAULT_WORKERS = min(4, os.cpu_count() or 1)
+DEFAULT_TIMEOUT_SECONDS = 10
+
+# Run inside the pool's worker processes; they only need bcrypt
+def _hash(password, rounds):
+    return bcrypt.hashpw(password, bcrypt.gensalt(rounds)).decode('utf-8')
+
+def _check(password, hashed):
+    return bcrypt.checkpw(password, hashed)
+
+def _settings():
+    config = current_app.config if has_app_context() else {}
+    workers = config.get('PASSWORD_HASH_WORKERS', DEFAULT_WORKERS)
+    return {
+        'rounds': config.get('BCRYPT_ROUNDS', DEFAULT_ROUNDS),
+        'workers': workers,
+        'max_pending': config.get('PASSWORD_HASH_MAX_PENDING') or max(1, workers) * 4,
+        'timeout': config.get('PASSWORD_HASH_TIMEOUT_SECONDS', DEFAULT_TIMEOUT_SECONDS)
+    }
+
+class _HashPool:
+    """A size-capped process pool for bcrypt.
+
+    At most `max_pending` hashes may be queued or running at once; callers
+    beyond that get TooManyRequests instead of waiting, so a login burst
+    cannot tie up every request thread. The pool is created lazily and
+    again after a fork, since executors do not survive one.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._executor = None
+        self._pid = None
+        self._pending = 0
+
+    def run(self, fn, *args):
+        return self.map(fn, [args])[0]
+
+    def map(self, fn, jobs):
+        """fn(*args) for every tuple in `jobs`, in order. At most `workers`
+        of them are in the pool at once, so a bulk import leaves the rest of
+        `max_pending` to logins."""
+        settings = _settings()
+        if settings['workers'] <= 0:
+            # Pool disabled: hash inline in the request thread
+            return [self._timed(fn, *args) for args in jobs]
+
+        results = []
+        for start in range(0, len(jobs), settings['workers']):
+            submitted = [self._submit(fn, args, settings) for args in jobs[start:start + settings['workers']]]
+            results.extend(self._result(executor, future, started, settings)
+                           for executor, future, started in submitted)
+        return results
+
+    def _submit(self, fn, args, settings):
+        with self._lock:
+            if self._pending >= settings['max_pending']:
+                metrics.inc('password_hash.rejected')
+                raise TooManyRequests(retry_after=self._retry_after(settings))
+            self._pending += 1
+            metrics.set_gauge('password_hash.pending', self._pending)
+            executor = self._get_executor(settings['workers'])
+
+        started = time.perf_counter()
+        try:
+            future = executor.submit(fn, *args)
+        except BaseException as e:
+            self._release()
+            if isinstance(e, BrokenProcessPool):
+                self._discard(executor)
+            raise
+        # A hash that is already running cannot be cancelled, so the slot is
+        # only freed once the worker is actually done with it
+        future.add_done_callback(self._release)
+        return executor, future, started
+
+    def _result(self, executor, future, started, settings):
+        try:
+            result = future.result(timeout=settings['timeout'])
+        except FutureTimeout:
+            future.cancel()
+            metrics.inc('password_hash.timeouts')
+            raise TooManyRequests(retry_after=self._retry_after(settings))
+        except BrokenProcessPool:
+            self._discard(executor)
+            raise
+        metrics.observe('password_hash.seconds', time.perf_counter() - started)
+        return result
+
+    def _release(self, future=None):
+        with self._lock:
+            self._pending -= 1
+            metrics.set_gauge('password_hash.pending', self._pending)
+
+    def _timed(self, fn, *args):
+        started = time.perf_counter()
+        result = fn(*args)
+        metrics.observe('password_hash.seconds', time.perf_counter() - started)
+        return result
+
+    def _get_executor(self, workers):
+        if self._executor is None or self._pid != os.getpid():
+            # Forking a threaded server is unsafe; forkserver children start clean
+            methods = multiprocessing.get_all_start_methods()
+            context = multiprocessing.get_context('forkserver' if 'forkserver' in methods else 'spawn')
+            self._executor = ProcessPoolExecutor(max_workers=workers, mp_context=context)
+            self._pid = os.getpid()
+            metrics.set_gauge('password_hash.workers', workers)
+        return self._executor
+
+    def _discard(self, executor):
+        with self._lock:
+            if self._executor is executor:
+                self._executor = None
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def _retry_after(self, settings):
+        # Time for the current backlog to drain at the observed hashing speed
+        average = metrics.average('password_hash.seconds', 0.25)
+        return math.ceil(average * self._pending / max(1, settings['workers']))
+
+_pool = _HashPool()
+
+def hash_password(password):
+    return _pool.run(_hash, password.encode('utf-8'), _settings()['rounds'])
+
+def hash_passwords(passwords):
+    """hash_password for many passwords, spread over the pool's workers."""
+    rounds = _settings()['rounds']
+    return _pool.map(_hash, [(password.encode('utf-8'), rounds) for password in passwords])
+
+def verify_password(password, hashed):
+    return _pool.run(_check, password.encode('utf-8'), hashed.encode('utf-8'))
+
+def hash_rounds(hashed):
+    """The cost factor of a bcrypt hash ("$2b$12$..." -> 12), or None."""
+    try:
+        return int(hashed.split('$')[2])
+    except (AttributeError, IndexError, ValueError):
+        return None
+
+def needs_rehash(hashed):
+    return hash_rounds(hashed) != _settings()['rounds']
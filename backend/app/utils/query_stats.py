@@ -0,0 +1,150 @@
+import re
+import threading
+import time
+from contextlib import contextmanager
+from flask import g, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Collapse the parts of a statement that vary between otherwise identical
+# queries: expanded IN lists and inline literals
+_IN_LIST = re.compile(r'\(\s*(?:\?|%\(\w+\)s|:\w+|\$\d+)(?:\s*,\s*(?:\?|%\(\w+\)s|:\w+|\$\d+))*\s*\)')
+_LITERAL = re.compile(r"'(?:[^']|'')*'|\b\d+\b")
+_WHITESPACE = re.compile(r'\s+')
+
+_local = threading.local()
+_listening = False
+_listening_lock = threading.Lock()
+
+class QueryBudgetExceeded(AssertionError):
+    """Raised in strict mode when a request runs more queries than its budget."""
+
+def statement_shape(statement):
+    shape = _IN_LIST.sub('(?)', statement)
+    shape = _LITERAL.sub('?', shape)
+    return _WHITESPACE.sub(' ', shape).strip()
+
+class QueryStats:
+    """Statements and database time recorded while this collector is active."""
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+        self.shapes = {}
+
+    def record(self, statement, seconds):
+        self.count += 1
+        self.seconds += seconds
+        shape = statement_shape(statement)
+        self.shapes[shape] = self.shapes.get(shape, 0) + 1
+
+    def repeated(self, threshold):
+        """Statement shapes run at least `threshold` times, most frequent first."""
+        return sorted(
+            ((shape, count) for shape, count in self.shapes.items() if count >= threshold),
+            key=lambda item: -item[1]
+        )
+
+def _collectors():
+    if not hasattr(_local, 'collectors'):
+        _local.collectors = []
+    return _local.collectors
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault('query_start', []).append(time.perf_counter())
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info['query_start'].pop()
+    collectors = _collectors()
+    if collectors:
+        elapsed = time.perf_counter() - started
+        for collector in collectors:
+            collector.record(statement, elapsed)
+
+def _handle_error(context):
+    # after_cursor_execute never runs for a statement the driver rejected
+    conn = context.connection
+    if context.execution_context is not None and conn is not None and conn.info.get('query_start'):
+        conn.info['query_start'].pop()
+
+def _listen():
+    # Engine-class events cover every engine, including ones created later
+    global _listening
+    with _listening_lock:
+        if not _listening:
+            event.listen(Engine, 'before_cursor_execute', _before_cursor_execute)
+            event.listen(Engine, 'after_cursor_execute', _after_cursor_execute)
+            event.listen(Engine, 'handle_error', _handle_error)
+            _listening = True
+
+@contextmanager
+def count_queries():
+    """Collect the statements run by this thread inside the block.
+
+        with count_queries() as stats:
+            client.get('/api/staff')
+        assert stats.count <= 3
+    """
+    _listen()
+    stats = QueryStats()
+    _collectors().append(stats)
+    try:
+        yield stats
+    finally:
+        _collectors().remove(stats)
+
+def query_budget(max_queries):
+    """Override SQL_QUERY_BUDGET for one view. Budgets count the ETag
+    version lookup, a cold reference cache and a token version lookup, none
+    of which depend on the page size."""
+    def decorator(f):
+        f.query_budget = max_queries
+        return f
+    return decorator
+
+def init_query_stats(app):
+    """Opt-in per-request query accounting, enabled by SQL_QUERY_STATS.
+
+    Each response gets a `Server-Timing: db;dur=<ms>;desc="<n> queries"`
+    header. Statement shapes repeated SQL_N_PLUS_ONE_THRESHOLD times are
+    logged as suspected N+1s. Requests over their query budget are logged,
+    or raise QueryBudgetExceeded when SQL_QUERY_BUDGET_STRICT is set (for
+    test runs). Queries run while a streamed body is sent are not counted.
+    """
+    if not app.config.get('SQL_QUERY_STATS'):
+        return
+    _listen()
+
+    @app.before_request
+    def start_query_stats():
+        g.query_stats = QueryStats()
+        _collectors().append(g.query_stats)
+
+    @app.after_request
+    def report_query_stats(response):
+        stats = g.pop('query_stats', None)
+        if stats is None:
+            return response
+        if stats in _collectors():
+            _collectors().remove(stats)
+
+        response.headers.add('Server-Timing', f'db;dur={stats.seconds * 1000:.2f};desc="{stats.count} queries"')
+
+        for shape, count in stats.repeated(app.config['SQL_N_PLUS_ONE_THRESHOLD']):
+            app.logger.warning('Suspected N+1 in %s %s: %d x %s', request.method, request.path, count, shape)
+
+        view = app.view_functions.get(request.endpoint)
+        budget = getattr(view, 'query_budget', app.config.get('SQL_QUERY_BUDGET'))
+        if budget is not None and stats.count > budget:
+            message = f'{request.method} {request.path} ran {stats.count} queries (budget {budget})'
+            if app.config.get('SQL_QUERY_BUDGET_STRICT'):
+                raise QueryBudgetExceeded(message)
+            app.logger.warning(message)
+        return response
+
+    @app.teardown_request
+    def stop_query_stats(exc):
+        # after_request does not run when the view raised
+        stats = g.pop('query_stats', None)
+        if stats is not None and stats in _collectors():
+            _collectors().remove(stats)
@@ -0,0 +1,157 @@
+import math
+import threading
+import time
+from collections import OrderedDict
+from flask import current_app
+from app.utils.errors import TooManyRequests
+from app.utils.metrics import metrics
+
+PERIODS = {'second': 1, 'minute': 60, 'hour': 3600, 'day': 86400}
+
+def parse_rate(rate):
+    """'10/minute' -> (capacity 10, refill 10/60 tokens per second)."""
+    try:
+        count, period = rate.split('/')
+        capacity = int(count)
+        seconds = PERIODS[period.strip()] if period.strip() in PERIODS else float(period)
+    except (AttributeError, KeyError, ValueError):
+        raise ValueError(f'Invalid rate limit {rate!r}, expected e.g. "10/minute"')
+    if capacity <= 0 or seconds <= 0:
+        raise ValueError(f'Invalid rate limit {rate!r}')
+    return capacity, capacity / seconds
+
+class MemoryBackend:
+    """Token buckets and TTL values in this process's memory.
+
+    Each worker process keeps its own buckets, so limits are per worker.
+    Keys are evicted least-recently-used beyond `max_keys` so that a flood
+    of distinct IPs or emails cannot grow memory without bound.
+    """
+
+    # Other workers cannot see these values
+    shared = False
+
+    def __init__(self, max_keys=100000):
+        self.max_keys = max_keys
+        self._lock = threading.Lock()
+        self._buckets = OrderedDict()
+        self._values = OrderedDict()
+
+    def take(self, key, capacity, rate, cost=1):
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated = self._buckets.pop(key, (capacity, now))
+            tokens = min(capacity, tokens + (now - updated) * rate)
+            allowed = tokens >= cost
+            if allowed:
+                tokens -= cost
+            self._store(self._buckets, key, (tokens, now))
+        return allowed, 0 if allowed else (cost - tokens) / rate
+
+    def get(self, key):
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                return None
+            value, expires = entry
+            if expires <= time.monotonic():
+                del self._values[key]
+                return None
+            return value
+
+    def set(self, key, value, ttl):
+        with self._lock:
+            self._values.pop(key, None)
+            self._store(self._values, key, (value, time.monotonic() + ttl))
+
+    def delete(self, *keys):
+        with self._lock:
+            for key in keys:
+                self._values.pop(key, None)
+
+    def _store(self, entries, key, entry):
+        entries[key] = entry
+        while len(entries) > self.max_keys:
+            entries.popitem(last=False)
+
+class RedisBackend:
+    """Token buckets shared by every worker and host through Redis.
+
+    Needs the optional `redis` package. The bucket update runs as one Lua
+    script using the server's clock, so it is atomic across clients.
+    """
+
+    shared = True
+
+    TAKE_SCRIPT = """
+    local capacity = tonumber(ARGV[1])
+    local rate = tonumber(ARGV[2])
+    local cost = tonumber(ARGV[3])
+    local clock = redis.call('TIME')
+    local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+    local state = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+    local tokens = tonumber(state[1]) or capacity
+    local updated = tonumber(state[2]) or now
+    tokens = math.min(capacity, tokens + math.max(0, now - updated) * rate)
+    local allowed = 0
+    if tokens >= cost then
+        tokens = tokens - cost
+        allowed = 1
+    end
+    redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'updated', tostring(now))
+    redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 1)
+    return {allowed, tostring(tokens)}
+    """
+
+    def __init__(self, url, prefix='student-management:'):
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError('RATE_LIMIT_STORAGE_URL points at Redis but the redis package is not installed')
+        self.prefix = prefix
+        self._client = redis.Redis.from_url(url)
+        self._take = self._client.register_script(self.TAKE_SCRIPT)
+
+    def take(self, key, capacity, rate, cost=1):
+        allowed, tokens = self._take(keys=[self.prefix + key], args=[capacity, rate, cost])
+        allowed = bool(int(allowed))
+        return allowed, 0 if allowed else (cost - float(tokens)) / rate
+
+    def get(self, key):
+        value = self._client.get(self.prefix + key)
+        return value.decode('utf-8') if value is not None else None
+
+    def set(self, key, value, ttl):
+        self._client.set(self.prefix + key, value, ex=max(1, math.ceil(ttl)))
+
+    def delete(self, *keys):
+        if keys:
+            self._client.delete(*(self.prefix + key for key in keys))
+
+_backends = {}
+_backends_lock = threading.Lock()
+
+def get_backend():
+    """The backend selected by RATE_LIMIT_STORAGE_URL: `memory://` (the
+    default) or a `redis://` / `rediss://` URL."""
+    url = current_app.config.get('RATE_LIMIT_STORAGE_URL') or 'memory://'
+    with _backends_lock:
+        if url not in _backends:
+            if url.startswith('memory://'):
+                _backends[url] = MemoryBackend()
+            elif url.startswith(('redis://', 'rediss://', 'unix://')):
+                _backends[url] = RedisBackend(url)
+            else:
+                raise RuntimeError(f'Unsupported RATE_LIMIT_STORAGE_URL {url!r}')
+        return _backends[url]
+
+def limit(scope, key, rate, message='Too many requests, please retry later'):
+    """Take one token from the `scope` bucket for `key`, raising
+    TooManyRequests when it is empty. Decisions are counted in metrics as
+    `rate_limit.<scope>.allowed` / `.rejected`."""
+    capacity, refill = parse_rate(rate)
+    allowed, retry_after = get_backend().take(f'rate:{scope}:{key}', capacity, refill)
+    if not allowed:
+        metrics.inc(f'rate_limit.{scope}.rejected')
+        raise TooManyRequests(message, retry_after=math.ceil(retry_after))
+    metrics.inc(f'rate_limit.{scope}.allowed')
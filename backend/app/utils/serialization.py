@@ -0,0 +1,80 @@
+from datetime import datetime
+from sqlalchemy.orm import load_only, selectinload
+
+SHAPES = ('nested', 'flat')
+
+def parse_shape(params):
+    """Return the requested response shape for list endpoints.
+
+    `nested` (the default) embeds related objects in every row; `flat`
+    returns foreign key ids plus a single deduplicated `included` table.
+    """
+    shape = (params or {}).get('shape') or 'nested'
+    if shape not in SHAPES:
+        raise ValueError(f"shape must be one of: {', '.join(SHAPES)}")
+    return shape
+
+def parse_fields(raw, allowed):
+    """Parse a sparse fieldset (`fields=name,registered_number`).
+
+    Accepts a comma separated string or a list. Returns None when no
+    fieldset was requested, otherwise the requested fields in order with
+    `id` always included.
+    """
+    if not raw:
+        return None
+    names = raw.split(',') if isinstance(raw, str) else list(raw)
+    fields = ['id']
+    for name in names:
+        name = str(name).strip()
+        if name and name not in fields:
+            fields.append(name)
+    unknown = [field for field in fields if field not in allowed]
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+    return fields
+
+def eager_load_options(model, relations=None):
+    """selectinload chains for the dotted paths in `model.EAGER_LOAD`.
+
+    Each hop costs one `SELECT .. WHERE id IN (..)` for the whole result,
+    so serializing a list takes a fixed number of queries however many
+    rows it has. With
+    `relations`, only paths starting at one of those relations are loaded.
+    """
+    options = []
+    for path in model.EAGER_LOAD:
+        names = path.split('.')
+        if relations is not None and names[0] not in relations:
+            continue
+        option, current = None, model
+        for name in names:
+            attribute = getattr(current, name)
+            option = selectinload(attribute) if option is None else option.selectinload(attribute)
+            current = attribute.property.mapper.class_
+        options.append(option)
+    return options
+
+def sparse_load_options(model, fields, relations=()):
+    """Loader options that SELECT only the columns behind `fields` and
+    eagerly load only the relations named in `fields`."""
+    columns = [getattr(model, field) for field in fields if field not in relations]
+    options = [load_only(*columns)]
+    requested = [relation for relation in relations if relation in fields]
+    if requested:
+        options.extend(eager_load_options(model, requested))
+    return options
+
+def serialize_fields(obj, fields, relations=(), references=None):
+    data = {}
+    for field in fields:
+        if field in relations and references is not None:
+            data[field] = references.related(field, getattr(obj, f'{field}_id'))
+            continue
+        value = getattr(obj, field)
+        if field in relations:
+            value = value.to_dict() if value is not None else None
+        elif isinstance(value, datetime):
+            value = value.isoformat()
+        data[field] = value
+    return data
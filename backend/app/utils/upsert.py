@@ -0,0 +1,34 @@
+from sqlalchemy.dialects import postgresql, sqlite
+
+# Dialects with INSERT .. ON CONFLICT DO UPDATE
+UPSERT_DIALECTS = {
+    'postgresql': postgresql.insert,
+    'sqlite': sqlite.insert
+}
+
+def increment(session, table, key, column, amount=1, **values):
+    """Add `amount` to `column` of the row whose primary key is `key`
+    ({column name: value}), inserting it with `amount` when there is none.
+    `values` are written on both paths.
+
+    On PostgreSQL and SQLite this is one INSERT .. ON CONFLICT DO UPDATE, so
+    two transactions creating the same row at once cannot both INSERT and
+    fail on the primary key. Other dialects UPDATE, then INSERT when no row
+    matched.
+    """
+    insert = table.insert()
+    dialect = session.get_bind(clause=insert).dialect.name
+    if dialect in UPSERT_DIALECTS:
+        stmt = UPSERT_DIALECTS[dialect](table).values(**key, **{column: amount}, **values)
+        session.execute(stmt.on_conflict_do_update(
+            index_elements=list(key),
+            set_={column: table.c[column] + amount, **values}
+        ))
+        return
+    result = session.execute(
+        table.update()
+        .where(*[table.c[name] == value for name, value in key.items()])
+        .values({column: table.c[column] + amount, **values})
+    )
+    if result.rowcount == 0:
+        session.execute(insert.values(**key, **{column: amount}, **values))
@@ -0,0 +1,43 @@
+from datetime import datetime
+from itertools import chain
+from sqlalchemy import event
+from app import db
+from app.models.table_version import TableVersion
+from app.utils.upsert import increment
+
+# Tables whose writes bump their row in `table_versions`
+TRACKED_TABLES = set()
+
+def track_tables(*table_names):
+    TRACKED_TABLES.update(table_names)
+
+def get_versions(table_names):
+    """Return {table_name: version} for `table_names` in a single query.
+    Tables that have never been written to report version 0."""
+    rows = db.session.query(TableVersion.table_name, TableVersion.version).filter(
+        TableVersion.table_name.in_(table_names)
+    ).all()
+    versions = dict.fromkeys(table_names, 0)
+    versions.update(rows)
+    return versions
+
+def bump_version(session, table_name):
+    """Increment `table_name`'s version. Writes that bypass the ORM flush
+    (bulk inserts, Core upserts) must call this themselves."""
+    increment(session, TableVersion.__table__, {'table_name': table_name}, 'version',
+              updated_at=datetime.utcnow())
+
+@event.listens_for(db.session, 'before_flush')
+def _bump_versions(session, flush_context, instances):
+    # Runs inside the flush, so the bump commits (or rolls back) together
+    # with the write that caused it.
+    touched = set()
+    for obj in chain(session.new, session.dirty, session.deleted):
+        table = getattr(obj, '__table__', None)
+        if table is None or table.name not in TRACKED_TABLES:
+            continue
+        if obj in session.dirty and not session.is_modified(obj):
+            continue
+        touched.add(table.name)
+    for table_name in sorted(touched):
+        bump_version(session, table_name)
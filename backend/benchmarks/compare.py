@@ -0,0 +1,66 @@
+"""Diff two benchmark reports.
+
+    python -m benchmarks.compare before.json after.json [--threshold 10]
+
+Prints p50/p95/p99, throughput and query deltas per scenario, and exits
+with status 1 when any scenario's p95 got more than --threshold percent
+slower or started running more queries.
+"""
+import argparse
+import json
+import sys
+
+def _change(before, after):
+    if before in (None, 0) or after is None:
+        return None
+    return (after - before) / before * 100
+
+def _format(before, after, unit=''):
+    change = _change(before, after)
+    suffix = f' ({change:+.1f}%)' if change is not None else ''
+    return f'{before}{unit} -> {after}{unit}{suffix}'
+
+def compare(before, after, threshold):
+    regressions = []
+    for name in sorted(set(before['scenarios']) | set(after['scenarios'])):
+        old, new = before['scenarios'].get(name), after['scenarios'].get(name)
+        if old is None or new is None:
+            print(f"{name}: only in {'after' if old is None else 'before'}")
+            continue
+        print(name)
+        for key in ('p50', 'p95', 'p99'):
+            print(f"  {key:<10} {_format(old['latency_ms'][key], new['latency_ms'][key], 'ms')}")
+        print(f"  {'rps':<10} {_format(old['throughput_rps'], new['throughput_rps'])}")
+        print(f"  {'queries':<10} {_format(old['queries_per_request'], new['queries_per_request'])}")
+        print(f"  {'errors':<10} {old['errors']} -> {new['errors']}")
+
+        slower = _change(old['latency_ms']['p95'], new['latency_ms']['p95'])
+        if slower is not None and slower > threshold:
+            regressions.append(f'{name}: p95 {slower:+.1f}%')
+        if (new['queries_per_request'] or 0) > (old['queries_per_request'] or 0):
+            regressions.append(f"{name}: queries {old['queries_per_request']} -> {new['queries_per_request']}")
+        if new['errors'] > old['errors']:
+            regressions.append(f"{name}: errors {old['errors']} -> {new['errors']}")
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Diff two benchmark reports')
+    parser.add_argument('before')
+    parser.add_argument('after')
+    parser.add_argument('--threshold', type=float, default=10.0, help='allowed p95 slowdown in percent')
+    args = parser.parse_args(argv)
+    with open(args.before) as f:
+        before = json.load(f)
+    with open(args.after) as f:
+        after = json.load(f)
+
+    print(f"before: {before['meta'].get('commit')}  after: {after['meta'].get('commit')}")
+    regressions = compare(before, after, args.threshold)
+    if regressions:
+        print('\nRegressions:')
+        for regression in regressions:
+            print(f'  {regression}')
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
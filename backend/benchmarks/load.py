@@ -0,0 +1,151 @@
+"""Drive scenarios against the app and summarize what happened.
+
+Two targets share one interface: `ClientTarget` calls the app in-process
+through the Flask test client (and counts queries exactly), `HttpTarget`
+talks to a running server over keep-alive HTTP connections (and reads
+query counts from the Server-Timing header when SQL_QUERY_STATS is on).
+"""
+import http.client
+import json
+import math
+import re
+import resource
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+from app.utils.query_stats import count_queries
+
+_SERVER_TIMING_QUERIES = re.compile(r'db;[^,]*desc="(\d+) queries"')
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an ascending list."""
+    if not sorted_values:
+        return None
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+def own_peak_rss_mb():
+    # ru_maxrss is in KiB on Linux
+    return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+
+def process_peak_rss_mb(pid):
+    try:
+        with open(f'/proc/{pid}/status') as status:
+            for line in status:
+                if line.startswith('VmHWM:'):
+                    return round(int(line.split()[1]) / 1024, 1)
+    except OSError:
+        pass
+    return None
+
+class ClientTarget:
+    """The app in this process, one test client per worker thread."""
+
+    rss_source = 'app process'
+
+    def __init__(self, app):
+        self.app = app
+        self._local = threading.local()
+
+    def request(self, method, path, body=None, token=None):
+        client = getattr(self._local, 'client', None)
+        if client is None:
+            client = self._local.client = self.app.test_client()
+        headers = {'Authorization': f'Bearer {token}'} if token else {}
+        with count_queries() as stats:
+            response = client.open(path, method=method, json=body, headers=headers)
+            # Drain streamed bodies so their queries and time are included
+            response.get_data()
+        return response.status_code, stats.count
+
+    def peak_rss_mb(self):
+        return own_peak_rss_mb()
+
+class HttpTarget:
+    """A running server at `base_url`, one keep-alive connection per thread."""
+
+    def __init__(self, base_url, server_pid=None):
+        parts = urlsplit(base_url)
+        self.connection_class = http.client.HTTPSConnection if parts.scheme == 'https' else http.client.HTTPConnection
+        self.netloc = parts.netloc
+        self.prefix = parts.path.rstrip('/')
+        self.server_pid = server_pid
+        self.rss_source = 'server process' if server_pid else 'load generator'
+        self._local = threading.local()
+
+    def request(self, method, path, body=None, token=None):
+        headers = {'Content-Type': 'application/json'}
+        if token:
+            headers['Authorization'] = f'Bearer {token}'
+        payload = json.dumps(body) if body is not None else None
+        for attempt in (1, 2):
+            connection = getattr(self._local, 'connection', None)
+            if connection is None:
+                connection = self._local.connection = self.connection_class(self.netloc, timeout=60)
+            try:
+                connection.request(method, self.prefix + path, body=payload, headers=headers)
+                response = connection.getresponse()
+                response.read()
+                break
+            except (http.client.HTTPException, OSError):
+                # The server closed an idle keep-alive connection; reconnect once
+                connection.close()
+                self._local.connection = None
+                if attempt == 2:
+                    raise
+        match = _SERVER_TIMING_QUERIES.search(response.getheader('Server-Timing') or '')
+        return response.status, int(match.group(1)) if match else None
+
+    def peak_rss_mb(self):
+        if self.server_pid:
+            return process_peak_rss_mb(self.server_pid)
+        return own_peak_rss_mb()
+
+def run_scenario(target, scenario, requests, concurrency):
+    """Send `requests` copies of `scenario` from `concurrency` threads and
+    return latency percentiles, throughput, query counts and peak RSS."""
+    # One unmeasured request warms caches and connections
+    target.request(scenario['method'], scenario['path'], scenario.get('json'), scenario.get('token'))
+
+    def one(_):
+        started = time.perf_counter()
+        try:
+            status, queries = target.request(
+                scenario['method'], scenario['path'], scenario.get('json'), scenario.get('token'))
+        except Exception as e:
+            return time.perf_counter() - started, type(e).__name__, None
+        return time.perf_counter() - started, status, queries
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        samples = list(pool.map(one, range(requests)))
+    wall = time.perf_counter() - started
+
+    latencies = sorted(sample[0] * 1000 for sample in samples)
+    statuses = {}
+    for _, status, _ in samples:
+        statuses[str(status)] = statuses.get(str(status), 0) + 1
+    queries = [sample[2] for sample in samples if sample[2] is not None]
+    expected = str(scenario.get('expect', 200))
+    errors = sum(count for status, count in statuses.items() if status != expected)
+
+    return {
+        'blueprint': scenario['blueprint'],
+        'method': scenario['method'],
+        'path': scenario['path'],
+        'requests': requests,
+        'concurrency': concurrency,
+        'errors': errors,
+        'statuses': statuses,
+        'latency_ms': {
+            'p50': round(percentile(latencies, 50), 3),
+            'p95': round(percentile(latencies, 95), 3),
+            'p99': round(percentile(latencies, 99), 3),
+            'mean': round(sum(latencies) / len(latencies), 3),
+            'max': round(latencies[-1], 3)
+        },
+        'throughput_rps': round(requests / wall, 1) if wall else None,
+        'queries_per_request': round(sum(queries) / len(queries), 2) if queries else None,
+        'peak_rss_mb': target.peak_rss_mb()
+    }
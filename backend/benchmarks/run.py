@@ -0,0 +1,116 @@
+"""Benchmark the API against a seeded synthetic university.
+
+Run from the backend directory:
+
+    python -m benchmarks.run --scale small --output before.json
+    python -m benchmarks.run --database postgresql://localhost/bench --scale full
+    python -m benchmarks.run --mode http --url http://localhost:5000 --server-pid 1234 --no-seed
+
+The database is dropped and reseeded unless --no-seed is given. The JSON
+report has one entry per scenario with p50/p95/p99 latency, throughput,
+queries per request and peak RSS; diff two of them with
+`python -m benchmarks.compare before.json after.json`.
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+DEFAULT_DATABASE = 'sqlite:///' + os.path.join(tempfile.gettempdir(), 'student-management-benchmark.db')
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--database', default=os.getenv('BENCHMARK_DATABASE_URL', DEFAULT_DATABASE),
+                        help='SQLAlchemy URL to seed and benchmark (default: a SQLite file in the temp dir)')
+    parser.add_argument('--scale', default='small', help='small, medium or full')
+    parser.add_argument('--no-seed', dest='seed', action='store_false', help='reuse an already seeded database')
+    parser.add_argument('--mode', choices=('client', 'http'), default='client',
+                        help='in-process test client, or HTTP against --url')
+    parser.add_argument('--url', help='base URL of a running server for --mode http')
+    parser.add_argument('--server-pid', type=int, help='report peak RSS of this process in --mode http')
+    parser.add_argument('--requests', type=int, default=200, help='requests per scenario')
+    parser.add_argument('--concurrency', type=int, default=4, help='concurrent clients per scenario')
+    parser.add_argument('--only', help='comma separated scenario name prefixes')
+    parser.add_argument('--output', help='write the JSON report here instead of stdout')
+    args = parser.parse_args(argv)
+    if args.mode == 'http' and not args.url:
+        parser.error('--mode http needs --url')
+    return args
+
+def git_commit():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', 'HEAD'], stderr=subprocess.DEVNULL, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    # Configure the app before create_app reads the environment; login
+    # throttling would otherwise turn the auth scenarios into 429s
+    os.environ['DATABASE_URL'] = args.database
+    os.environ.setdefault('LOGIN_RATE_LIMIT_IP', '1000000/second')
+    os.environ.setdefault('LOGIN_RATE_LIMIT_EMAIL', '1000000/second')
+
+    from app import create_app, db
+    from benchmarks.load import ClientTarget, HttpTarget, run_scenario
+    from benchmarks.scenarios import build_scenarios
+    from benchmarks.seed import SCALES, seed_university
+
+    if args.scale not in SCALES:
+        sys.exit(f"--scale must be one of: {', '.join(SCALES)}")
+
+    app = create_app()
+    report = {
+        'meta': {
+            'commit': git_commit(),
+            'started_at': datetime.now(timezone.utc).isoformat(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'mode': args.mode,
+            'scale': args.scale,
+            'requests': args.requests,
+            'concurrency': args.concurrency
+        },
+        'scenarios': {}
+    }
+
+    with app.app_context():
+        report['meta']['database'] = db.engine.url.render_as_string(hide_password=True)
+        report['meta']['dialect'] = db.engine.dialect.name
+        if args.seed:
+            started = time.perf_counter()
+            report['meta']['seeded'] = seed_university(args.scale)
+            report['meta']['seed_seconds'] = round(time.perf_counter() - started, 1)
+            print(f"Seeded {report['meta']['seeded']} in {report['meta']['seed_seconds']}s", file=sys.stderr)
+        scenarios = build_scenarios(app)
+
+    target = ClientTarget(app) if args.mode == 'client' else HttpTarget(args.url, args.server_pid)
+    report['meta']['rss_source'] = target.rss_source
+    prefixes = [prefix.strip() for prefix in args.only.split(',')] if args.only else None
+
+    for scenario in scenarios:
+        if prefixes and not any(scenario['name'].startswith(prefix) for prefix in prefixes):
+            continue
+        requests = max(1, int(args.requests * scenario.get('repeat', 1)))
+        result = run_scenario(target, scenario, requests, args.concurrency)
+        report['scenarios'][scenario['name']] = result
+        latency = result['latency_ms']
+        print(f"{scenario['name']:<32} p50 {latency['p50']:>9.2f}ms  p95 {latency['p95']:>9.2f}ms  "
+              f"{result['throughput_rps']:>8} rps  queries {result['queries_per_request']}  "
+              f"errors {result['errors']}", file=sys.stderr)
+
+    output = json.dumps(report, indent=2, sort_keys=True)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output + '\n')
+    else:
+        print(output)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,95 @@
+"""The requests each benchmark run measures, at least one per blueprint.
+
+Scenarios only read, or write idempotently (privacy updates), so repeated
+runs against the same seeded database stay comparable.
+"""
+from app import db
+from app.models.campus import Campus
+from app.models.course import Course
+from app.models.department import Department
+from app.models.major import Major
+from app.models.staff import Staff
+from app.models.student import Student
+from app.models.user import User
+from benchmarks.seed import ADMIN_EMAIL, ADMIN_PASSWORD, STUDENT_PASSWORD, student_email
+
+def login(app, email, password):
+    response = app.test_client().post('/api/auth/login', json={'email': email, 'password': password})
+    return response.get_json()['data']['token']
+
+def build_scenarios(app):
+    """Scenarios for the seeded database behind `app`.
+
+    Ids are looked up and tokens minted in-process; a server under HTTP
+    load must share the database and JWT_SECRET_KEY for them to be valid.
+    Needs an app context.
+    """
+    student = Student.query.order_by(Student.registered_number).first()
+    student_login = db.session.get(User, student.user_id).email
+    staff = Staff.query.first()
+    campus = Campus.query.first()
+    department = Department.query.first()
+    course = Course.query.first()
+    major = Major.query.first()
+
+    admin_token = login(app, ADMIN_EMAIL, ADMIN_PASSWORD)
+    student_token = login(app, student_login, STUDENT_PASSWORD)
+    term = student.name.split()[0][:4]
+
+    return [
+        # `repeat` scales the run's request count (bcrypt makes logins slow
+        # by design); `expect` is the status that does not count as an error
+        {'name': 'auth.login', 'blueprint': 'auth_bp', 'method': 'POST', 'path': '/api/auth/login',
+         'json': {'email': student_email(0), 'password': STUDENT_PASSWORD}, 'repeat': 0.1},
+        {'name': 'auth.login_unknown', 'blueprint': 'auth_bp', 'method': 'POST', 'path': '/api/auth/login',
+         'json': {'email': 'nobody@benchmark.local', 'password': 'x'}, 'expect': 400},
+
+        {'name': 'students.list_page', 'blueprint': 'students_bp', 'method': 'GET',
+         'path': '/api/students?limit=50', 'token': student_token},
+        {'name': 'students.list_page_flat', 'blueprint': 'students_bp', 'method': 'GET',
+         'path': '/api/students?limit=50&shape=flat', 'token': student_token},
+        {'name': 'students.list_page_sparse', 'blueprint': 'students_bp', 'method': 'GET',
+         'path': '/api/students?limit=50&fields=name,registered_number', 'token': student_token},
+        {'name': 'students.list_by_course', 'blueprint': 'students_bp', 'method': 'GET',
+         'path': f'/api/students?course_id={course.id}', 'token': student_token},
+        {'name': 'students.detail', 'blueprint': 'students_bp', 'method': 'GET',
+         'path': f'/api/students/{student.id}', 'token': student_token},
+        {'name': 'students.search', 'blueprint': 'students_bp', 'method': 'POST',
+         'path': '/api/students/search', 'json': {'search_term': term, 'limit': 50}, 'token': student_token},
+        {'name': 'students.search_filtered', 'blueprint': 'students_bp', 'method': 'POST',
+         'path': '/api/students/search',
+         'json': {'search_term': term, 'campus_id': campus.id, 'limit': 50}, 'token': student_token},
+        {'name': 'students.export_department', 'blueprint': 'students_bp', 'method': 'GET',
+         'path': f'/api/students/export?format=ndjson&department_id={department.id}',
+         'token': admin_token, 'repeat': 0.1},
+
+        {'name': 'staff.list', 'blueprint': 'staff_bp', 'method': 'GET', 'path': '/api/staff',
+         'token': admin_token},
+        {'name': 'staff.detail', 'blueprint': 'staff_bp', 'method': 'GET', 'path': f'/api/staff/{staff.id}',
+         'token': admin_token},
+
+        {'name': 'privacy.list_own', 'blueprint': 'privacy_bp', 'method': 'GET', 'path': '/api/privacy-settings',
+         'token': student_token},
+        {'name': 'privacy.by_student', 'blueprint': 'privacy_bp', 'method': 'GET',
+         'path': f'/api/privacy-settings/student/{student.id}', 'token': student_token},
+        {'name': 'privacy.bulk_update', 'blueprint': 'privacy_bp', 'method': 'PUT',
+         'path': '/api/privacy-settings/bulk', 'token': student_token,
+         'json': [{'field_name': 'mobile', 'is_private': True}, {'field_name': 'present_address', 'is_private': False}]},
+
+        {'name': 'campuses.list', 'blueprint': 'campus_bp', 'method': 'GET', 'path': '/api/campuses'},
+        {'name': 'campuses.detail', 'blueprint': 'campus_bp', 'method': 'GET', 'path': f'/api/campuses/{campus.id}'},
+        {'name': 'departments.list', 'blueprint': 'department_bp', 'method': 'GET', 'path': '/api/departments'},
+        {'name': 'departments.by_campus', 'blueprint': 'department_bp', 'method': 'GET',
+         'path': f'/api/departments?campus_id={campus.id}'},
+        {'name': 'courses.list', 'blueprint': 'course_bp', 'method': 'GET', 'path': '/api/courses'},
+        {'name': 'majors.list', 'blueprint': 'major_bp', 'method': 'GET', 'path': '/api/majors'},
+        {'name': 'majors.detail', 'blueprint': 'major_bp', 'method': 'GET', 'path': f'/api/majors/{major.id}'},
+
+        {'name': 'stats.dashboard', 'blueprint': 'stats_bp', 'method': 'GET', 'path': '/api/stats',
+         'token': admin_token},
+        {'name': 'stats.students_by_campus', 'blueprint': 'stats_bp', 'method': 'GET',
+         'path': '/api/stats/students/campus', 'token': admin_token},
+
+        {'name': 'metrics.get', 'blueprint': 'metrics_bp', 'method': 'GET', 'path': '/api/metrics',
+         'token': admin_token},
+    ]
@@ -0,0 +1,144 @@
+"""Synthetic university data for the benchmarks.
+
+Rows are written through the models' tables with multi-row INSERTs, so the
+schema (and its FTS/trigram DDL) is exactly what the app uses, without
+paying for ORM unit-of-work bookkeeping on 100k students.
+"""
+import random
+import uuid
+from datetime import datetime
+from app import db
+from app.models.campus import Campus
+from app.models.course import Course
+from app.models.department import Department
+from app.models.major import Major
+from app.models.privacy_setting import PrivacyProfile, PRIVACY_BITS
+from app.models.staff import Staff
+from app.models.student import Student
+from app.models.user import User, UserRole
+from app.utils.passwords import hash_password
+from app.utils.versioning import bump_version
+
+SCALES = {
+    'small': {'campuses': 2, 'departments': 10, 'courses': 50, 'majors': 10, 'students': 2000},
+    'medium': {'campuses': 5, 'departments': 50, 'courses': 500, 'majors': 30, 'students': 20000},
+    # Matches production: 900k legacy privacy rows are 100k bitmasks
+    'full': {'campuses': 10, 'departments': 200, 'courses': 2000, 'majors': 50, 'students': 100000},
+}
+
+ADMIN_EMAIL = 'admin@benchmark.local'
+ADMIN_PASSWORD = 'benchmark-admin'
+STUDENT_PASSWORD = 'benchmark-student'
+BATCH_SIZE = 5000
+# Share of students that have marked at least one field private
+PRIVATE_SHARE = 0.3
+
+FIRST_NAMES = ('Aarav', 'Maya', 'Liam', 'Sofia', 'Noah', 'Zara', 'Ethan', 'Amara', 'Lucas', 'Ishaan',
+               'Chloe', 'Mateo', 'Nadia', 'Oscar', 'Priya', 'Ravi', 'Sana', 'Tomas', 'Uma', 'Yusuf')
+LAST_NAMES = ('Perera', 'Silva', 'Fernando', 'Smith', 'Garcia', 'Khan', 'Nguyen', 'Muller', 'Rossi',
+              'Tanaka', 'Okafor', 'Haddad', 'Jensen', 'Kowalski', 'Novak', 'Santos', 'Walsh', 'Yilmaz')
+
+def _insert(model, rows):
+    for start in range(0, len(rows), BATCH_SIZE):
+        db.session.execute(model.__table__.insert(), rows[start:start + BATCH_SIZE])
+
+def student_email(index):
+    return f'student{index}@benchmark.local'
+
+def seed_university(scale='small', seed=42):
+    """Drop and recreate every table, then load a university of `scale`.
+
+    Returns the counts that were written. Must run inside an app context.
+    """
+    sizes = SCALES[scale]
+    rng = random.Random(seed)
+    now = datetime.utcnow()
+
+    db.drop_all()
+    db.create_all()
+
+    campuses = [{'id': str(uuid.uuid4()), 'name': f'Campus {i + 1}', 'address': f'{i + 1} University Road',
+                 'created_at': now} for i in range(sizes['campuses'])]
+    departments = [{'id': str(uuid.uuid4()), 'name': f'Department {i + 1}',
+                    'campus_id': campuses[i % len(campuses)]['id'], 'created_at': now}
+                   for i in range(sizes['departments'])]
+    courses = [{'id': str(uuid.uuid4()), 'name': f'Course {i + 1}', 'description': None,
+                'department_id': departments[i % len(departments)]['id'], 'created_at': now}
+               for i in range(sizes['courses'])]
+    majors = [{'id': str(uuid.uuid4()), 'name': f'Major {i + 1}', 'description': None, 'created_at': now}
+              for i in range(sizes['majors'])]
+    for model, rows in ((Campus, campuses), (Department, departments), (Course, courses), (Major, majors)):
+        _insert(model, rows)
+
+    departments_by_campus = {}
+    for department in departments:
+        departments_by_campus.setdefault(department['campus_id'], []).append(department)
+    courses_by_department = {}
+    for course in courses:
+        courses_by_department.setdefault(course['department_id'], []).append(course)
+
+    # One real hash per password; bcrypt per row would dominate seeding
+    admin_hash = hash_password(ADMIN_PASSWORD)
+    student_hash = hash_password(STUDENT_PASSWORD)
+
+    admin_id = str(uuid.uuid4())
+    users = [{'id': admin_id, 'email': ADMIN_EMAIL, 'password': admin_hash, 'created_at': now}]
+    roles = [{'id': str(uuid.uuid4()), 'user_id': admin_id, 'role': 'admin', 'created_at': now}]
+    staff = []
+    for i, department in enumerate(departments):
+        user_id = str(uuid.uuid4())
+        users.append({'id': user_id, 'email': f'staff{i}@benchmark.local', 'password': admin_hash, 'created_at': now})
+        roles.append({'id': str(uuid.uuid4()), 'user_id': user_id, 'role': 'admin', 'created_at': now})
+        staff.append({'id': str(uuid.uuid4()), 'user_id': user_id, 'full_name': f'Staff Member {i + 1}',
+                      'department_id': department['id'], 'campus_id': department['campus_id'],
+                      'designation': 'Lecturer', 'mobile': f'07{i:08d}', 'email': f'staff{i}@benchmark.local',
+                      'created_at': now})
+
+    students, profiles = [], []
+    bits = list(PRIVACY_BITS.values())
+    for i in range(sizes['students']):
+        user_id = str(uuid.uuid4())
+        campus = rng.choice(campuses)
+        department = rng.choice(departments_by_campus.get(campus['id']) or departments)
+        course = rng.choice(courses_by_department.get(department['id']) or courses)
+        year = rng.randint(2015, 2025)
+        users.append({'id': user_id, 'email': student_email(i), 'password': student_hash, 'created_at': now})
+        roles.append({'id': str(uuid.uuid4()), 'user_id': user_id, 'role': 'student', 'created_at': now})
+        students.append({
+            'id': str(uuid.uuid4()),
+            'user_id': user_id,
+            'name': f'{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}',
+            'registered_number': f'{year}{i:06d}',
+            'year_of_admission': year,
+            'campus_id': campus['id'],
+            'course_id': course['id'],
+            'major_id': rng.choice(majors)['id'],
+            'department_id': department['id'],
+            'mobile': f'07{rng.randrange(10 ** 8):08d}',
+            'personal_email': f'personal{i}@example.com',
+            'emergency_contact': f'07{rng.randrange(10 ** 8):08d}',
+            'present_address': f'{rng.randint(1, 999)} Main Street',
+            'permanent_address': f'{rng.randint(1, 999)} Hill Road',
+            'photo_url': None,
+            'is_alumnus': year < 2019,
+            'created_at': now
+        })
+        if rng.random() < PRIVATE_SHARE:
+            mask = 0
+            for bit in rng.sample(bits, rng.randint(1, 3)):
+                mask |= bit
+            profiles.append({'user_id': user_id, 'private_mask': mask, 'updated_at': now})
+
+    for model, rows in ((User, users), (UserRole, roles), (Staff, staff), (Student, students),
+                        (PrivacyProfile, profiles)):
+        _insert(model, rows)
+    # Core inserts bypass the flush hook; start every cache from a clean version
+    for table_name in ('campuses', 'departments', 'courses', 'majors', 'students', 'staff', 'privacy_profiles'):
+        bump_version(db.session, table_name)
+    db.session.commit()
+
+    return {
+        'campuses': len(campuses), 'departments': len(departments), 'courses': len(courses),
+        'majors': len(majors), 'staff': len(staff), 'students': len(students),
+        'privacy_profiles': len(profiles)
+    }
@@ -0,0 +1,190 @@
+"""Measure cold start: imports, create_app and time to first request.
+
+    python -m benchmarks.startup --scale small
+    python -m benchmarks.startup --no-seed --runs 10 --output startup.json
+    python -m benchmarks.startup --server --no-seed
+
+Every run is a fresh interpreter, like a scaled-to-zero instance waking up.
+By default each one imports the app, calls create_app and sends GET --path
+through the test client; with --server it starts gunicorn with one worker
+and times the first HTTP response instead. Times are medians over --runs
+and include interpreter startup.
+
+One more run under `python -X importtime` lists the slowest packages. Exits
+with status 1 when the median import or first request time is over its
+budget, or when serving imports a CLI-only package (alembic).
+"""
+import argparse
+import json
+import os
+import platform
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from collections import Counter
+from datetime import datetime, timezone
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Only `flask db` needs these; see app/utils/migrations.py
+CLI_ONLY_IMPORTS = ('alembic', 'flask_migrate')
+
+# Run in the child; prints one JSON line of wall clock timestamps
+_CHILD = """
+import json, sys, time
+imported = time.time()
+from app import create_app
+imported = time.time() - imported
+created = time.time()
+app = create_app()
+created, started = time.time() - created, time.time()
+client = app.test_client()
+status = client.get(sys.argv[1]).status_code
+first = time.time()
+client.get(sys.argv[1])
+print(json.dumps({'import': imported, 'create_app': created, 'first_done': first,
+                  'warm': time.time() - first, 'status': status}))
+"""
+
+def parse_args(argv=None):
+    from benchmarks.run import DEFAULT_DATABASE
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--database', default=os.getenv('BENCHMARK_DATABASE_URL', DEFAULT_DATABASE),
+                        help='SQLAlchemy URL the app starts against (default: a SQLite file in the temp dir)')
+    parser.add_argument('--scale', default='small', help='small, medium or full')
+    parser.add_argument('--no-seed', dest='seed', action='store_false', help='reuse an already seeded database')
+    parser.add_argument('--runs', type=int, default=5, help='fresh processes to start')
+    parser.add_argument('--path', default='/api/campuses', help='the first request')
+    parser.add_argument('--server', action='store_true', help='time the first response from gunicorn')
+    parser.add_argument('--import-budget-ms', type=float, default=1000,
+                        help='fail when importing the app takes longer (median)')
+    parser.add_argument('--first-request-budget-ms', type=float, default=2000,
+                        help='fail when process start to first response takes longer (median)')
+    parser.add_argument('--output', help='write the JSON report here')
+    return parser.parse_args(argv)
+
+def _ms(seconds):
+    return round(seconds * 1000, 1)
+
+def run_client(path):
+    """One cold start through the test client; phase times in ms."""
+    started = time.time()
+    output = subprocess.run([sys.executable, '-c', _CHILD, path], cwd=BACKEND_DIR, check=True,
+                            capture_output=True, text=True).stdout
+    child = json.loads(output.strip().splitlines()[-1])
+    if child['status'] >= 400:
+        raise RuntimeError(f"GET {path} returned {child['status']}")
+    return {
+        'import_ms': _ms(child['import']),
+        'create_app_ms': _ms(child['create_app']),
+        'first_request_ms': _ms(child['first_done'] - started),
+        'warm_request_ms': _ms(child['warm'])
+    }
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+def run_server(path, timeout=60):
+    """One cold gunicorn start; ms from spawning it to the first response."""
+    port = _free_port()
+    env = {**os.environ, 'PORT': str(port), 'WEB_CONCURRENCY': '1'}
+    started = time.time()
+    server = subprocess.Popen([sys.executable, '-m', 'gunicorn'], cwd=BACKEND_DIR, env=env,
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        while time.time() - started < timeout:
+            if server.poll() is not None:
+                raise RuntimeError(f'gunicorn exited with status {server.returncode}')
+            try:
+                with urllib.request.urlopen(f'http://127.0.0.1:{port}{path}', timeout=timeout) as response:
+                    response.read()
+                return {'first_request_ms': _ms(time.time() - started)}
+            except (ConnectionError, urllib.error.URLError):
+                time.sleep(0.01)
+        raise RuntimeError(f'no response from gunicorn within {timeout}s')
+    finally:
+        server.terminate()
+        server.wait()
+
+def import_profile(limit=15):
+    """(slowest packages [(package, ms)], every module imported) for
+    serving, from `python -X importtime -c 'import wsgi'`. A package's time
+    is the self time of all its modules."""
+    stderr = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import wsgi'], cwd=BACKEND_DIR,
+                            check=True, capture_output=True, text=True).stderr
+    packages, modules = Counter(), set()
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or line.count('|') != 2:
+            continue
+        self_us, _, name = line[len('import time:'):].split('|')
+        if not self_us.strip().isdigit():
+            continue  # the header
+        name = name.strip()
+        modules.add(name)
+        packages[name.split('.')[0]] += int(self_us)
+    return [(package, _ms(us / 1e6)) for package, us in packages.most_common(limit)], modules
+
+def main(argv=None):
+    args = parse_args(argv)
+    os.environ['DATABASE_URL'] = args.database
+
+    from benchmarks.run import git_commit
+    from benchmarks.seed import SCALES, seed_university
+
+    if args.scale not in SCALES:
+        sys.exit(f"--scale must be one of: {', '.join(SCALES)}")
+
+    if args.seed:
+        from app import create_app
+        with create_app().app_context():
+            print(f'Seeded {seed_university(args.scale)}', file=sys.stderr)
+
+    runs = [run_server(args.path) if args.server else run_client(args.path) for _ in range(args.runs)]
+    medians = {key: round(statistics.median(run[key] for run in runs), 1) for key in runs[0]}
+    top, modules = import_profile()
+    cli_only = sorted(name for name in modules if name.split('.')[0] in CLI_ONLY_IMPORTS)
+
+    for key, value in medians.items():
+        print(f'{key:<20} {value:>9.1f}ms', file=sys.stderr)
+    print('slowest packages to import (-X importtime):', file=sys.stderr)
+    for name, ms in top:
+        print(f'    {name:<40} {ms:>9.1f}ms', file=sys.stderr)
+
+    failures = []
+    if 'import_ms' in medians and medians['import_ms'] > args.import_budget_ms:
+        failures.append(f"import took {medians['import_ms']}ms, budget {args.import_budget_ms}ms")
+    if medians['first_request_ms'] > args.first_request_budget_ms:
+        failures.append(f"first request after {medians['first_request_ms']}ms, "
+                        f'budget {args.first_request_budget_ms}ms')
+    if cli_only:
+        failures.append(f"serving imports CLI-only modules: {', '.join(cli_only[:5])}")
+
+    if args.output:
+        report = {
+            'meta': {
+                'commit': git_commit(),
+                'started_at': datetime.now(timezone.utc).isoformat(),
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                'mode': 'server' if args.server else 'client',
+                'path': args.path,
+                'runs': args.runs
+            },
+            'median': medians,
+            'runs': runs,
+            'slowest_imports': dict(top),
+            'failures': failures
+        }
+        with open(args.output, 'w') as f:
+            f.write(json.dumps(report, indent=2, sort_keys=True) + '\n')
+    for failure in failures:
+        print(failure, file=sys.stderr)
+    sys.exit(1 if failures else 0)
+
+if __name__ == '__main__':
+    main()
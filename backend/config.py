@@ -1,18 +1,101 @@
 import os
+from datetime import timedelta
 from dotenv import load_dotenv
 
 load_dotenv()
 
+def env_bool(name, default=False):
+    value = os.getenv(name)
+    if value is None or value == '':
+        return default
+    return value.strip().lower() in ('1', 'true', 'yes', 'on')
+
+def env_int(name, default=None):
+    value = os.getenv(name)
+    return int(value) if value not in (None, '') else default
+
 class Config:
     # Database
-    SQLALCHEMY_DATABASE_URI = os.getenv('DATABASE_URL')
+    SQLALCHEMY_DATABASE_URI = os.getenv('DATABASE_URL', 'sqlite:///app.db')
     SQLALCHEMY_TRACK_MODIFICATIONS = False
-    
+
+    # Connection pool; turned into SQLALCHEMY_ENGINE_OPTIONS by create_app.
+    # DB_POOL_PROFILE=pgbouncer is for PgBouncer in transaction mode: shorter
+    # recycling and no server-side prepared statements.
+    DB_POOL_PROFILE = os.getenv('DB_POOL_PROFILE', 'default')
+    DB_POOL_SIZE = env_int('DB_POOL_SIZE', 5)
+    DB_MAX_OVERFLOW = env_int('DB_MAX_OVERFLOW', 10)
+    DB_POOL_TIMEOUT = env_int('DB_POOL_TIMEOUT', 30)
+    DB_POOL_RECYCLE = env_int('DB_POOL_RECYCLE', 300 if DB_POOL_PROFILE == 'pgbouncer' else 1800)
+    DB_POOL_PRE_PING = env_bool('DB_POOL_PRE_PING', True)
+    # LIFO reuse lets surplus connections sit idle long enough to be recycled
+    DB_POOL_USE_LIFO = env_bool('DB_POOL_USE_LIFO', True)
+    # Let an external pooler own every connection (SQLAlchemy NullPool)
+    DB_POOL_DISABLED = env_bool('DB_POOL_DISABLED', False)
+
+    # Read replicas (comma separated URLs). Read-only requests use a replica
+    # less than DB_REPLICA_MAX_LAG_SECONDS behind; a user who just wrote reads
+    # from the primary for DB_REPLICA_STICKY_SECONDS.
+    DATABASE_REPLICA_URLS = [url.strip() for url in os.getenv('DATABASE_REPLICA_URLS', '').split(',') if url.strip()]
+    DB_REPLICA_MAX_LAG_SECONDS = float(os.getenv('DB_REPLICA_MAX_LAG_SECONDS', '10'))
+    DB_REPLICA_LAG_CHECK_SECONDS = float(os.getenv('DB_REPLICA_LAG_CHECK_SECONDS', '5'))
+    DB_REPLICA_STICKY_SECONDS = env_int('DB_REPLICA_STICKY_SECONDS', 5)
+
     # JWT
     JWT_SECRET_KEY = os.getenv('JWT_SECRET_KEY', 'your-secret-key')
-    JWT_ACCESS_TOKEN_EXPIRES = 3600  # 1 hour
-    
+    JWT_ACCESS_TOKEN_EXPIRES = timedelta(hours=1)
+    # How long a worker trusts its cached token version: after a revocation,
+    # other workers keep accepting the old tokens for up to this long. 0
+    # checks the database on every authenticated request
+    JWT_TOKEN_VERSION_CACHE_SECONDS = env_int('JWT_TOKEN_VERSION_CACHE_SECONDS', 5)
+    # Users whose token version each worker keeps cached (least recently used are dropped)
+    JWT_TOKEN_VERSION_CACHE_SIZE = env_int('JWT_TOKEN_VERSION_CACHE_SIZE', 10000)
+
+    # Password hashing runs in a capped process pool (0 workers = inline)
+    BCRYPT_ROUNDS = env_int('BCRYPT_ROUNDS', 12)
+    PASSWORD_HASH_WORKERS = env_int('PASSWORD_HASH_WORKERS', min(4, os.cpu_count() or 1))
+    PASSWORD_HASH_MAX_PENDING = env_int('PASSWORD_HASH_MAX_PENDING') or None
+    PASSWORD_HASH_TIMEOUT_SECONDS = float(os.getenv('PASSWORD_HASH_TIMEOUT_SECONDS', '10'))
+
+    # Login throttling; set RATE_LIMIT_STORAGE_URL to a redis:// URL to share
+    # buckets between workers
+    RATE_LIMIT_STORAGE_URL = os.getenv('RATE_LIMIT_STORAGE_URL', 'memory://')
+    LOGIN_RATE_LIMIT_IP = os.getenv('LOGIN_RATE_LIMIT_IP', '30/minute')
+    LOGIN_RATE_LIMIT_EMAIL = os.getenv('LOGIN_RATE_LIMIT_EMAIL', '10/minute')
+    # Logins for emails found not to exist are rejected without a query for
+    # this long. Only with a redis:// RATE_LIMIT_STORAGE_URL: registering an
+    # email clears its entry, which with memory:// only happens in the
+    # worker that registered it, so the others would refuse the new account
+    # until the entry expired
+    LOGIN_UNKNOWN_EMAIL_CACHE_SECONDS = env_int('LOGIN_UNKNOWN_EMAIL_CACHE_SECONDS', 30)
+
+    # Per-request SQL accounting (Server-Timing, N+1 warnings, query budgets)
+    SQL_QUERY_STATS = env_bool('SQL_QUERY_STATS')
+    SQL_N_PLUS_ONE_THRESHOLD = env_int('SQL_N_PLUS_ONE_THRESHOLD', 5)
+    SQL_QUERY_BUDGET = env_int('SQL_QUERY_BUDGET')
+    SQL_QUERY_BUDGET_STRICT = env_bool('SQL_QUERY_BUDGET_STRICT')
+
+    # Serve /api/stats from the stat_counts summary table, kept up to date on
+    # every student/staff write (run `flask stats rebuild` after enabling)
+    STATS_SUMMARY_TABLES = env_bool('STATS_SUMMARY_TABLES')
+
+    # Response encoder: 'auto' uses orjson when it is installed
+    JSON_PROVIDER = os.getenv('JSON_PROVIDER', 'auto')
+
+    # Response compression, in server preference order; br and zstd are
+    # offered only when the brotli / zstandard packages are installed
+    COMPRESSION_ENCODINGS = [name.strip() for name in os.getenv('COMPRESSION_ENCODINGS', 'zstd,br,gzip').split(',') if name.strip()]
+    COMPRESSION_MIN_SIZE = env_int('COMPRESSION_MIN_SIZE', 1024)
+    COMPRESSION_GZIP_LEVEL = env_int('COMPRESSION_GZIP_LEVEL', 6)
+    COMPRESSION_BR_LEVEL = env_int('COMPRESSION_BR_LEVEL', 4)
+    COMPRESSION_ZSTD_LEVEL = env_int('COMPRESSION_ZSTD_LEVEL', 3)
+    COMPRESSION_MIMETYPES = ['application/json', 'application/x-ndjson', 'text/csv', 'text/plain', 'text/html']
+
     # CORS
-    CORS_ORIGINS = ['http://localhost:3000']
-    CORS_METHODS = ['GET', 'POST', 'PUT', 'DELETE']
-    CORS_HEADERS = ['Content-Type', 'Authorization'] 
\ No newline at end of file
+    CORS_ORIGINS = [
+        'http://localhost:3000',
+        'https://localhost:3000',
+        'https://student-management-nine-beige.vercel.app'
+    ]
+    CORS_METHODS = ['GET', 'POST', 'PUT', 'DELETE', 'OPTIONS']
+    CORS_HEADERS = ['Content-Type', 'Authorization']
@@ -0,0 +1,88 @@
+"""Gunicorn settings, read automatically when gunicorn starts in this
+directory. Every value can be overridden with the environment variable
+next to it (or on the command line).
+
+Profiles (GUNICORN_PROFILE):
+  gthread  2*CPU+1 workers (at most MAX_WORKERS) with GUNICORN_THREADS
+           threads each. The default; blocking database calls just occupy
+           a thread.
+  gevent   one worker per CPU (at most MAX_WORKERS) serving GUNICORN_WORKER_CONNECTIONS
+           greenlets. Needs `pip install gevent psycogreen`.
+
+The app is imported once in the master (preload_app) and forked, so
+workers share its memory and a broken import fails the deploy instead of
+every worker. Each worker then replaces the database connections it
+inherited (see post_fork).
+"""
+import math
+import os
+
+profile = os.getenv('GUNICORN_PROFILE', 'gthread')
+if profile not in ('gthread', 'gevent'):
+    raise RuntimeError('GUNICORN_PROFILE must be gthread or gevent')
+
+if profile == 'gevent':
+    # Before the app (and its locks and sockets) is imported by preload
+    from gevent import monkey
+    monkey.patch_all()
+    try:
+        from psycogreen.gevent import patch_psycopg
+        patch_psycopg()
+    except ImportError:
+        # Without it every psycopg2 query blocks the whole worker
+        pass
+
+wsgi_app = 'wsgi:app'
+bind = f"0.0.0.0:{os.getenv('PORT', '5000')}"
+
+# WEB_CONCURRENCY is never capped
+MAX_WORKERS = 12
+
+def available_cpus():
+    """CPUs this process may actually use: the ones it is pinned to, fewer
+    when a cgroup v2 quota (a container CPU limit) allows less. os.cpu_count()
+    would report every CPU of the host."""
+    cpus = len(os.sched_getaffinity(0)) if hasattr(os, 'sched_getaffinity') else os.cpu_count() or 1
+    try:
+        with open('/sys/fs/cgroup/cpu.max') as f:
+            quota, period = f.read().split()
+        if quota != 'max':
+            cpus = min(cpus, math.ceil(int(quota) / int(period)))
+    except (OSError, ValueError):
+        pass
+    return max(cpus, 1)
+
+cpus = available_cpus()
+worker_class = profile
+workers = int(os.getenv('WEB_CONCURRENCY') or min(cpus if profile == 'gevent' else 2 * cpus + 1, MAX_WORKERS))
+# Keep threads within DB_POOL_SIZE + DB_MAX_OVERFLOW, or they queue for a connection
+threads = int(os.getenv('GUNICORN_THREADS', '4'))
+worker_connections = int(os.getenv('GUNICORN_WORKER_CONNECTIONS', '100'))
+
+preload_app = os.getenv('GUNICORN_PRELOAD', 'true').lower() in ('1', 'true', 'yes', 'on')
+
+# Requests slower than this get the worker killed and restarted
+timeout = int(os.getenv('GUNICORN_TIMEOUT', '30'))
+# Time in-flight requests get to finish on reload or shutdown
+graceful_timeout = int(os.getenv('GUNICORN_GRACEFUL_TIMEOUT', '30'))
+# Longer than the load balancer's idle timeout would leave it sending on
+# connections the worker is about to close
+keepalive = int(os.getenv('GUNICORN_KEEPALIVE', '5'))
+
+# Recycle workers now and then so slow leaks cannot accumulate; the jitter
+# keeps them from restarting all at once
+max_requests = int(os.getenv('GUNICORN_MAX_REQUESTS', '2000'))
+max_requests_jitter = max_requests // 10
+
+accesslog = os.getenv('GUNICORN_ACCESS_LOG') or None
+loglevel = os.getenv('GUNICORN_LOG_LEVEL', 'info')
+
+def post_fork(server, worker):
+    if not server.cfg.preload_app:
+        return
+    from app import db
+    from app.utils.db_pool import dispose_inherited_engines
+    from app.utils.metrics import metrics
+    dispose_inherited_engines(server.app.wsgi(), db)
+    # Metrics are per worker; start from zero rather than the master's copy
+    metrics.reset()
@@ -0,0 +1,104 @@
+"""Store privacy settings as one bitmask per user
+
+Revision ID: 1b9e5f2d7c40
+Revises: f8d3b17c2a06
+Create Date: 2026-10-18 13:40:22.918364
+
+"""
+from datetime import datetime
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '1b9e5f2d7c40'
+down_revision = 'f8d3b17c2a06'
+branch_labels = None
+depends_on = None
+
+
+# Frozen copy of app.models.privacy_setting.PRIVACY_FIELDS at this revision;
+# a field's bit is its position in the tuple.
+PRIVACY_FIELDS = (
+    "name", "registered_number", "year_of_admission", "mobile", "personal_email",
+    "emergency_contact", "present_address", "permanent_address", "photo_url"
+)
+
+privacy_settings = sa.table('privacy_settings',
+    sa.column('id', sa.Integer),
+    sa.column('user_id', sa.String),
+    sa.column('field_name', sa.String),
+    sa.column('is_private', sa.Boolean),
+    sa.column('created_at', sa.DateTime)
+)
+
+privacy_profiles = sa.table('privacy_profiles',
+    sa.column('user_id', sa.String),
+    sa.column('private_mask', sa.Integer),
+    sa.column('updated_at', sa.DateTime)
+)
+
+
+def upgrade():
+    op.create_table('privacy_profiles',
+        sa.Column('user_id', sa.String(length=36), nullable=False),
+        sa.Column('private_mask', sa.Integer(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('user_id')
+    )
+
+    # Fold the private rows of each user into a mask. Users with nothing
+    # private need no row; settings for fields outside the registry are
+    # dropped, as the API never honoured them.
+    bind = op.get_bind()
+    masks = {}
+    rows = bind.execute(
+        sa.select(privacy_settings.c.user_id, privacy_settings.c.field_name)
+        .where(privacy_settings.c.is_private == sa.true())
+    )
+    for user_id, field_name in rows:
+        if field_name in PRIVACY_FIELDS:
+            masks[str(user_id)] = masks.get(str(user_id), 0) | (1 << PRIVACY_FIELDS.index(field_name))
+
+    now = datetime.utcnow()
+    profiles = [
+        {'user_id': user_id, 'private_mask': mask, 'updated_at': now}
+        for user_id, mask in masks.items()
+    ]
+    for start in range(0, len(profiles), 1000):
+        op.bulk_insert(privacy_profiles, profiles[start:start + 1000])
+
+    op.drop_table('privacy_settings')
+
+
+def downgrade():
+    op.create_table('privacy_settings',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.String(length=36), nullable=False),
+        sa.Column('field_name', sa.String(length=50), nullable=False),
+        sa.Column('is_private', sa.Boolean(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('id')
+    )
+
+    bind = op.get_bind()
+    settings = []
+    rows = bind.execute(sa.select(
+        privacy_profiles.c.user_id, privacy_profiles.c.private_mask, privacy_profiles.c.updated_at
+    ))
+    for user_id, mask, updated_at in rows:
+        settings.extend(
+            {
+                'user_id': user_id,
+                'field_name': field,
+                'is_private': bool(mask & (1 << bit)),
+                'created_at': updated_at
+            }
+            for bit, field in enumerate(PRIVACY_FIELDS)
+        )
+    for start in range(0, len(settings), 1000):
+        op.bulk_insert(privacy_settings, settings[start:start + 1000])
+
+    op.drop_table('privacy_profiles')
@@ -0,0 +1,30 @@
+"""Add stat_counts summary table for dashboard statistics
+
+Revision ID: 6c0d2e9b4a17
+Revises: 1b9e5f2d7c40
+Create Date: 2026-10-18 16:05:41.208337
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '6c0d2e9b4a17'
+down_revision = '1b9e5f2d7c40'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Filled by `flask stats rebuild` when STATS_SUMMARY_TABLES is turned on
+    op.create_table('stat_counts',
+        sa.Column('dimension', sa.String(length=64), nullable=False),
+        sa.Column('group_key', sa.String(length=64), nullable=False),
+        sa.Column('total', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('dimension', 'group_key')
+    )
+
+
+def downgrade():
+    op.drop_table('stat_counts')
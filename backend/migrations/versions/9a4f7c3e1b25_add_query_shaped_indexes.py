@@ -0,0 +1,70 @@
+"""Replace single-column student FK indexes with query-shaped composites
+
+Revision ID: 9a4f7c3e1b25
+Revises: 6c0d2e9b4a17
+Create Date: 2026-10-18 17:12:09.431876
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9a4f7c3e1b25'
+down_revision = '6c0d2e9b4a17'
+branch_labels = None
+depends_on = None
+
+
+# Databases created from schema.sql already have some of these, databases
+# created by the models have none, hence IF [NOT] EXISTS throughout.
+COMMON_UPGRADE = [
+    # (fk, name, id) covers lookups by the FK alone as well
+    "DROP INDEX IF EXISTS idx_students_campus_id",
+    "DROP INDEX IF EXISTS idx_students_department_id",
+    "DROP INDEX IF EXISTS idx_students_course_id",
+    "DROP INDEX IF EXISTS idx_students_major_id",
+    "CREATE INDEX IF NOT EXISTS idx_students_campus_name_id ON students (campus_id, name, id)",
+    "CREATE INDEX IF NOT EXISTS idx_students_department_name_id ON students (department_id, name, id)",
+    "CREATE INDEX IF NOT EXISTS idx_students_course_name_id ON students (course_id, name, id)",
+    "CREATE INDEX IF NOT EXISTS idx_students_major_name_id ON students (major_id, name, id)",
+    "CREATE INDEX IF NOT EXISTS idx_students_user_id ON students (user_id)",
+    "CREATE INDEX IF NOT EXISTS idx_staff_user_id ON staff (user_id)",
+    "CREATE INDEX IF NOT EXISTS idx_staff_department_id ON staff (department_id)",
+    "CREATE INDEX IF NOT EXISTS idx_staff_campus_id ON staff (campus_id)",
+    "CREATE INDEX IF NOT EXISTS idx_user_roles_user_id ON user_roles (user_id)",
+]
+
+# The predicate must match the literal search_students renders
+PARTIAL_UPGRADE = {
+    'sqlite': "CREATE INDEX IF NOT EXISTS idx_students_current_name_id ON students (name, id) "
+              "WHERE is_alumnus = 0",
+    'postgresql': "CREATE INDEX IF NOT EXISTS idx_students_current_name_id ON students (name, id) "
+                  "WHERE is_alumnus = false",
+}
+
+DOWNGRADE = [
+    "DROP INDEX IF EXISTS idx_students_current_name_id",
+    "DROP INDEX IF EXISTS idx_students_major_name_id",
+    "DROP INDEX IF EXISTS idx_students_course_name_id",
+    "DROP INDEX IF EXISTS idx_students_department_name_id",
+    "DROP INDEX IF EXISTS idx_students_campus_name_id",
+    "CREATE INDEX IF NOT EXISTS idx_students_campus_id ON students (campus_id)",
+    "CREATE INDEX IF NOT EXISTS idx_students_department_id ON students (department_id)",
+    "CREATE INDEX IF NOT EXISTS idx_students_course_id ON students (course_id)",
+    "CREATE INDEX IF NOT EXISTS idx_students_major_id ON students (major_id)",
+]
+
+
+def upgrade():
+    dialect = op.get_bind().dialect.name
+    for statement in COMMON_UPGRADE:
+        op.execute(statement)
+    if dialect in PARTIAL_UPGRADE:
+        op.execute(PARTIAL_UPGRADE[dialect])
+
+
+def downgrade():
+    # The user_id indexes predate this revision in schema.sql, so they stay
+    for statement in DOWNGRADE:
+        op.execute(statement)
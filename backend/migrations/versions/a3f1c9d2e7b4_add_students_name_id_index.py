@@ -0,0 +1,26 @@
+"""Add (name, id) index for keyset pagination of students
+
+Revision ID: a3f1c9d2e7b4
+Revises: 5514304f6b50
+Create Date: 2026-10-18 09:12:41.308215
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a3f1c9d2e7b4'
+down_revision = '5514304f6b50'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('students', schema=None) as batch_op:
+        batch_op.create_index('idx_students_name_id', ['name', 'id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('students', schema=None) as batch_op:
+        batch_op.drop_index('idx_students_name_id')
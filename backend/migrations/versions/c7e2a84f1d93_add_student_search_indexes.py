@@ -0,0 +1,69 @@
+"""Add full-text and trigram search indexes for students
+
+Revision ID: c7e2a84f1d93
+Revises: a3f1c9d2e7b4
+Create Date: 2026-10-18 10:04:17.552930
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c7e2a84f1d93'
+down_revision = 'a3f1c9d2e7b4'
+branch_labels = None
+depends_on = None
+
+
+SQLITE_UPGRADE = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS students_fts USING fts5("
+    "student_id UNINDEXED, name, registered_number, "
+    "tokenize = 'unicode61 remove_diacritics 2')",
+    "CREATE TRIGGER IF NOT EXISTS students_fts_ai AFTER INSERT ON students BEGIN "
+    "INSERT INTO students_fts (student_id, name, registered_number) "
+    "VALUES (new.id, new.name, new.registered_number); END",
+    "CREATE TRIGGER IF NOT EXISTS students_fts_ad AFTER DELETE ON students BEGIN "
+    "DELETE FROM students_fts WHERE student_id = old.id; END",
+    "CREATE TRIGGER IF NOT EXISTS students_fts_au AFTER UPDATE OF id, name, registered_number ON students BEGIN "
+    "UPDATE students_fts SET student_id = new.id, name = new.name, registered_number = new.registered_number "
+    "WHERE student_id = old.id; END",
+    "INSERT INTO students_fts (student_id, name, registered_number) "
+    "SELECT id, name, registered_number FROM students",
+]
+
+SQLITE_DOWNGRADE = [
+    "DROP TRIGGER IF EXISTS students_fts_au",
+    "DROP TRIGGER IF EXISTS students_fts_ad",
+    "DROP TRIGGER IF EXISTS students_fts_ai",
+    "DROP TABLE IF EXISTS students_fts",
+]
+
+POSTGRES_UPGRADE = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE INDEX IF NOT EXISTS idx_students_search_document ON students USING gin "
+    "(to_tsvector('simple', coalesce(name, '') || ' ' || coalesce(registered_number, '')))",
+    "CREATE INDEX IF NOT EXISTS idx_students_name_trgm ON students USING gin (name gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS idx_students_registered_number_trgm ON students USING gin "
+    "(registered_number gin_trgm_ops)",
+]
+
+POSTGRES_DOWNGRADE = [
+    "DROP INDEX IF EXISTS idx_students_registered_number_trgm",
+    "DROP INDEX IF EXISTS idx_students_name_trgm",
+    "DROP INDEX IF EXISTS idx_students_search_document",
+]
+
+
+def _run(statements_by_dialect):
+    dialect = op.get_bind().dialect.name
+    for statement in statements_by_dialect.get(dialect, []):
+        op.execute(statement)
+
+
+def upgrade():
+    _run({'sqlite': SQLITE_UPGRADE, 'postgresql': POSTGRES_UPGRADE})
+
+
+def downgrade():
+    _run({'sqlite': SQLITE_DOWNGRADE, 'postgresql': POSTGRES_DOWNGRADE})
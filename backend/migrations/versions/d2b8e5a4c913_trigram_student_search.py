@@ -0,0 +1,48 @@
+"""Rebuild the SQLite student search table with the trigram tokenizer
+
+Revision ID: d2b8e5a4c913
+Revises: 9a4f7c3e1b25
+Create Date: 2026-10-18 21:36:52.184306
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd2b8e5a4c913'
+down_revision = '9a4f7c3e1b25'
+branch_labels = None
+depends_on = None
+
+
+# The triggers only name the table, so they keep working across the rebuild
+def _rebuild(tokenize):
+    return [
+        "DROP TABLE IF EXISTS students_fts",
+        "CREATE VIRTUAL TABLE students_fts USING fts5("
+        f"student_id UNINDEXED, name, registered_number, tokenize = '{tokenize}')",
+        "INSERT INTO students_fts (student_id, name, registered_number) "
+        "SELECT id, name, registered_number FROM students",
+    ]
+
+
+# Trigrams let FTS5 serve substring matches ("CS042" in "2021CS042");
+# needs SQLite 3.34 or later
+SQLITE_UPGRADE = _rebuild('trigram')
+
+SQLITE_DOWNGRADE = _rebuild('unicode61 remove_diacritics 2')
+
+
+def _run(statements_by_dialect):
+    dialect = op.get_bind().dialect.name
+    for statement in statements_by_dialect.get(dialect, []):
+        op.execute(statement)
+
+
+def upgrade():
+    _run({'sqlite': SQLITE_UPGRADE})
+
+
+def downgrade():
+    _run({'sqlite': SQLITE_DOWNGRADE})
@@ -0,0 +1,29 @@
+"""Add table_versions for cache invalidation
+
+Revision ID: e41b6d0a9c58
+Revises: c7e2a84f1d93
+Create Date: 2026-10-18 11:21:06.774190
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e41b6d0a9c58'
+down_revision = 'c7e2a84f1d93'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('table_versions',
+        sa.Column('table_name', sa.String(length=64), nullable=False),
+        sa.Column('version', sa.Integer(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('table_name')
+    )
+
+
+def downgrade():
+    op.drop_table('table_versions')
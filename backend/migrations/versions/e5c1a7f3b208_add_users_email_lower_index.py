@@ -0,0 +1,24 @@
+"""Index users by lower(email) for case-insensitive logins
+
+Revision ID: e5c1a7f3b208
+Revises: d2b8e5a4c913
+Create Date: 2026-10-18 22:41:05.736219
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e5c1a7f3b208'
+down_revision = 'd2b8e5a4c913'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.execute("CREATE INDEX IF NOT EXISTS idx_users_email_lower ON users (lower(email))")
+
+
+def downgrade():
+    op.execute("DROP INDEX IF EXISTS idx_users_email_lower")
@@ -0,0 +1,30 @@
+"""Add token_versions for JWT revocation
+
+Revision ID: f8d3b17c2a06
+Revises: e41b6d0a9c58
+Create Date: 2026-10-18 12:02:53.130447
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f8d3b17c2a06'
+down_revision = 'e41b6d0a9c58'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('token_versions',
+        sa.Column('user_id', sa.String(length=36), nullable=False),
+        sa.Column('version', sa.Integer(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('user_id')
+    )
+
+
+def downgrade():
+    op.drop_table('token_versions')
@@ -1,6 +1,9 @@
+# Development server (auto-reload, debugger). Serve production traffic
+# through gunicorn instead: see wsgi.py and gunicorn.conf.py.
+import os
 from app import create_app
 
 app = create_app()
 
 if __name__ == '__main__':
-    app.run(debug=True, port=5000) 
\ No newline at end of file
+    app.run(debug=True, port=int(os.getenv('PORT', '5000')))
@@ -0,0 +1,8 @@
+"""Production entry point.
+
+    gunicorn                          # settings from gunicorn.conf.py
+    GUNICORN_PROFILE=gevent gunicorn  # after `pip install gevent psycogreen`
+"""
+from app import create_app
+
+app = create_app()
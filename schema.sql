@@ -49,6 +49,13 @@ CREATE TABLE user_roles (
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
 
+-- Token versions (bumped to revoke a user's outstanding JWTs)
+CREATE TABLE token_versions (
+    user_id VARCHAR(36) PRIMARY KEY REFERENCES users(id),
+    version INTEGER NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
 -- Students
 CREATE TABLE students (
     id VARCHAR(36) PRIMARY KEY,
@@ -106,23 +113,40 @@ CREATE TABLE staff (
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
 
--- Privacy Settings
-CREATE TABLE privacy_settings (
-    id VARCHAR(36) PRIMARY KEY,
-    user_id VARCHAR(36) REFERENCES users(id),
-    field_name VARCHAR(50) NOT NULL,
-    is_private BOOLEAN DEFAULT false,
-    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+-- Privacy Settings (one bitmask per user; bit N = Nth field in PRIVACY_FIELDS)
+CREATE TABLE privacy_profiles (
+    user_id VARCHAR(36) PRIMARY KEY REFERENCES users(id),
+    private_mask INTEGER NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Per-table change counters used to invalidate caches
+CREATE TABLE table_versions (
+    table_name VARCHAR(64) PRIMARY KEY,
+    version INTEGER NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Dashboard statistics per (dimension, group), e.g. students per campus
+CREATE TABLE stat_counts (
+    dimension VARCHAR(64) NOT NULL,
+    group_key VARCHAR(64) NOT NULL,
+    total INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (dimension, group_key)
 );
 
 -- Create indexes for better performance
 CREATE INDEX idx_students_user_id ON students(user_id);
-CREATE INDEX idx_students_campus_id ON students(campus_id);
-CREATE INDEX idx_students_course_id ON students(course_id);
-CREATE INDEX idx_students_major_id ON students(major_id);
-CREATE INDEX idx_students_department_id ON students(department_id);
+CREATE INDEX idx_students_name_id ON students(name, id);
+-- Directory filters followed by the (name, id) keyset order
+CREATE INDEX idx_students_campus_name_id ON students(campus_id, name, id);
+CREATE INDEX idx_students_department_name_id ON students(department_id, name, id);
+CREATE INDEX idx_students_course_name_id ON students(course_id, name, id);
+CREATE INDEX idx_students_major_name_id ON students(major_id, name, id);
+-- Search lists current students only
+CREATE INDEX idx_students_current_name_id ON students(name, id) WHERE is_alumnus = false;
 CREATE INDEX idx_staff_user_id ON staff(user_id);
 CREATE INDEX idx_staff_department_id ON staff(department_id);
 CREATE INDEX idx_staff_campus_id ON staff(campus_id);
 CREATE INDEX idx_user_roles_user_id ON user_roles(user_id);
-CREATE INDEX idx_privacy_settings_user_id ON privacy_settings(user_id); 
\ No newline at end of file
+ 
\ No newline at end of file
@@ -9,13 +9,7 @@ import {
   FaBook,
   FaGraduationCap,
 } from "react-icons/fa";
-import {
-  studentsAPI,
-  campusesAPI,
-  coursesAPI,
-  majorsAPI,
-  departmentsAPI,
-} from "@/lib/apiClient";
+import { statsAPI } from "@/lib/apiClient";
 
 export default function AdminDashboard() {
   const [stats, setStats] = useState({
@@ -48,26 +42,15 @@ export default function AdminDashboard() {
 
   const fetchStats = async () => {
     try {
-      const [
-        { data: studentsData },
-        { data: campusesData },
-        { data: coursesData },
-        { data: majorsData },
-        { data: departmentsData },
-      ] = await Promise.all([
-        studentsAPI.getAll(),
-        campusesAPI.getAll(),
-        coursesAPI.getAll(),
-        majorsAPI.getAll(),
-        departmentsAPI.getAll(),
-      ]);
+      const { data } = await statsAPI.getAll();
+      const totals = data?.totals || {};
 
       setStats({
-        totalStudents: studentsData?.data?.length || 0,
-        totalCampuses: campusesData?.length || 0,
-        totalCourses: coursesData?.length || 0,
-        totalMajors: majorsData?.length || 0,
-        totalDepartments: departmentsData?.length || 0,
+        totalStudents: totals.students || 0,
+        totalCampuses: totals.campuses || 0,
+        totalCourses: totals.courses || 0,
+        totalMajors: totals.majors || 0,
+        totalDepartments: totals.departments || 0,
       });
     } catch (err) {
       console.error("Error fetching stats:", err);
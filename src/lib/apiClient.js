@@ -6,8 +6,9 @@ const PUBLIC_ENDPOINTS = [
   "/courses",
   "/majors",
   "/departments",
-  "/students",
 ];
+// /students is public too, but it is not listed: the token decides which
+// private fields the caller may see, so it is sent whenever there is one
 
 // List of admin operations that always require authorization
 const ADMIN_OPERATIONS = ["POST", "PUT", "DELETE"];
@@ -332,6 +333,13 @@ export const interestsAPI = {
     }),
 };
 
+// Stats API
+export const statsAPI = {
+  // Totals plus per-campus/department/course/major/year breakdowns
+  getAll: () => apiRequest("/stats"),
+  getGroup: (entity, group) => apiRequest(`/stats/${entity}/${group}`),
+};
+
 // Staff API
 export const staffAPI = {
   getStaff: () => apiRequest("/staff"),